@@ -0,0 +1 @@
+"""Offline benchmarks for the Shinobi Video integration."""
@@ -0,0 +1,176 @@
+"""A local stand-in for a Shinobi server, used by the benchmarks.
+
+Serves the endpoints the integration uses for a simulated fleet, with
+configurable latency, error rate, status churn and MJPEG frame rate.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import json
+import random
+import zlib
+
+from aiohttp import web
+
+API_KEY = "benchapikey"
+GROUP_KEY = "benchgroup"
+
+
+@dataclass
+class FakeShinobiConfig:
+    """Shape of the simulated fleet."""
+
+    monitors: int = 80
+    latency: float = 0.0
+    error_rate: float = 0.0
+    # Fraction of monitors whose status changes between two list requests
+    churn: float = 0.0
+    fps: float = 10.0
+    snapshot_size: int = 200_000
+    details_size: int = 4_000
+
+
+@dataclass
+class FakeShinobiStats:
+    """Requests served, per endpoint."""
+
+    requests: dict[str, int] = field(default_factory=dict)
+    bytes_sent: int = 0
+
+    def count(self, endpoint: str, size: int = 0) -> None:
+        """Count one request."""
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        self.bytes_sent += size
+
+
+class FakeShinobi:
+    """An aiohttp application that behaves like a Shinobi server."""
+
+    def __init__(self, config: FakeShinobiConfig | None = None) -> None:
+        """Initialize the server."""
+        self.config = config or FakeShinobiConfig()
+        self.stats = FakeShinobiStats()
+        self._runner: web.AppRunner | None = None
+        self._monitors = [self._make_monitor(index) for index in range(self.config.monitors)]
+        self._snapshot = b"\xff\xd8" + random.randbytes(self.config.snapshot_size) + b"\xff\xd9"
+        self.url = ""
+
+        self.app = web.Application()
+        self.app.router.add_get("/{api_key}/monitor/{group_key}", self._monitor_list)
+        self.app.router.add_get("/{api_key}/monitor/{group_key}/{mid}/{mode}", self._change_mode)
+        self.app.router.add_get("/{api_key}/jpeg/{group_key}/{mid}/s.jpg", self._jpeg)
+        self.app.router.add_get("/{api_key}/mjpeg/{group_key}/{mid}", self._mjpeg)
+
+    def _make_monitor(self, index: int) -> dict:
+        """Build one simulated monitor."""
+        mid = f"m{index:04d}"
+        details = {"stream_type": "hls", "padding": "x" * self.config.details_size}
+        return {
+            "mid": mid,
+            "ke": GROUP_KEY,
+            "name": f"Camera {index}",
+            "type": "h264",
+            "status": "Watching",
+            "mode": "start",
+            "details": json.dumps(details),
+            "streams": [f"/{API_KEY}/hls/{GROUP_KEY}/{mid}/s.m3u8"],
+        }
+
+    async def start(self) -> str:
+        """Start serving on a free local port and return the base URL."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _simulate(self, request: web.Request) -> None:
+        """Apply latency, auth and errors."""
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        if request.match_info["api_key"] != API_KEY:
+            raise web.HTTPUnauthorized()
+        if self.config.error_rate and random.random() < self.config.error_rate:
+            raise web.HTTPServiceUnavailable()
+
+    async def _monitor_list(self, request: web.Request) -> web.Response:
+        """Serve the monitor list."""
+        await self._simulate(request)
+        if self.config.churn:
+            for monitor in random.sample(self._monitors, int(len(self._monitors) * self.config.churn)):
+                monitor["status"] = "Recording" if monitor["status"] == "Watching" else "Watching"
+        body = json.dumps(self._monitors).encode()
+        # Weak ETag like Express, answering 304 when the list is unchanged
+        etag = f'W/"{zlib.crc32(body):08x}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.stats.count("monitors")
+            return web.Response(status=304, headers={"ETag": etag})
+        self.stats.count("monitors", len(body))
+        return web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+
+    async def _change_mode(self, request: web.Request) -> web.Response:
+        """Change the mode of a monitor."""
+        await self._simulate(request)
+        mid = request.match_info["mid"]
+        for monitor in self._monitors:
+            if monitor["mid"] == mid:
+                monitor["mode"] = request.match_info["mode"]
+        self.stats.count("mode")
+        return web.json_response({"ok": True})
+
+    async def _jpeg(self, request: web.Request) -> web.Response:
+        """Serve a snapshot."""
+        await self._simulate(request)
+        self.stats.count("jpeg", len(self._snapshot))
+        return web.Response(body=self._snapshot, content_type="image/jpeg")
+
+    async def _mjpeg(self, request: web.Request) -> web.StreamResponse:
+        """Serve an endless MJPEG stream."""
+        await self._simulate(request)
+        self.stats.count("mjpeg")
+        response = web.StreamResponse()
+        response.headers["Content-Type"] = "multipart/x-mixed-replace; boundary=shinobi"
+        await response.prepare(request)
+        frame = (
+            b"--shinobi\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n%s\r\n"
+            % (len(self._snapshot), self._snapshot)
+        )
+        try:
+            while True:
+                await response.write(frame)
+                self.stats.bytes_sent += len(frame)
+                await asyncio.sleep(1 / self.config.fps)
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        return response
+
+
+async def main() -> None:
+    """Run a fake server until interrupted."""
+    import argparse  # pylint: disable=import-outside-toplevel
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--monitors", type=int, default=80)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fps", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = FakeShinobi(
+        FakeShinobiConfig(args.monitors, args.latency, args.error_rate, fps=args.fps)
+    )
+    print(f"Fake Shinobi at {await server.start()} (API key {API_KEY}, group {GROUP_KEY})")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
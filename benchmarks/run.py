@@ -0,0 +1,196 @@
+"""Benchmarks for the Shinobi Video integration against a fake server.
+
+Runs entirely on localhost:
+
+    python -m benchmarks.run --monitors 80 --viewers 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+from aiohttp import web
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.shinobi.api import ShinobiApi
+from custom_components.shinobi.coordinator import ShinobiDataUpdateCoordinator
+from custom_components.shinobi.mjpeg import MjpegRelayManager
+from custom_components.shinobi.sensor import ShinobiStatusSensor
+from custom_components.shinobi.switch import ShinobiRecordingSwitch
+
+from .fake_shinobi import API_KEY, GROUP_KEY, FakeShinobi, FakeShinobiConfig
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return a percentile of a list of values."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def bench_refresh(hass: HomeAssistant, session: aiohttp.ClientSession, server: FakeShinobi, cycles: int) -> dict:
+    """Measure coordinator refresh latency and entity state writes per cycle."""
+    api = ShinobiApi(session, server.url, API_KEY, GROUP_KEY)
+    coordinator = ShinobiDataUpdateCoordinator(hass, {"": api})
+    await coordinator.async_refresh()
+
+    writes = 0
+
+    def _count() -> None:
+        nonlocal writes
+        writes += 1
+
+    for monitor in coordinator.data.values():
+        for entity in (
+            ShinobiStatusSensor(coordinator, monitor),
+            ShinobiRecordingSwitch(coordinator, api, monitor),
+        ):
+            entity.async_write_ha_state = _count
+            coordinator.async_add_listener(entity._handle_coordinator_update)
+    # The first update writes everything, like adding the entities would
+    await coordinator.async_refresh()
+    writes = 0
+
+    bytes_before = server.stats.bytes_sent
+    latencies = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "refresh_p50_ms": statistics.median(latencies) * 1000,
+        "refresh_p95_ms": _percentile(latencies, 95) * 1000,
+        "bytes_per_refresh": (server.stats.bytes_sent - bytes_before) / cycles,
+        "state_writes_per_cycle": writes / cycles,
+    }
+
+
+async def bench_snapshots(session: aiohttp.ClientSession, server: FakeShinobi, viewers: int, rounds: int) -> dict:
+    """Measure snapshot throughput with many viewers of every monitor."""
+    api = ShinobiApi(session, server.url, API_KEY, GROUP_KEY)
+    mids = [f"m{index:04d}" for index in range(server.config.monitors)]
+    upstream_before = server.stats.requests.get("jpeg", 0)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(
+            *(api.async_get_camera_image(mid) for mid in mids for _ in range(viewers))
+        )
+        api.snapshot_cache.clear()
+    elapsed = time.perf_counter() - start
+
+    served = rounds * viewers * len(mids)
+    return {
+        "snapshots_per_second": served / elapsed,
+        "upstream_fetches": server.stats.requests.get("jpeg", 0) - upstream_before,
+        "snapshots_served": served,
+    }
+
+
+async def bench_mjpeg(session: aiohttp.ClientSession, server: FakeShinobi, viewers: int, duration: float) -> dict:
+    """Measure relayed frames per second and memory per MJPEG viewer."""
+    api = ShinobiApi(session, server.url, API_KEY, GROUP_KEY)
+    relays = MjpegRelayManager()
+    stream_url = f"/{API_KEY}/mjpeg/{GROUP_KEY}/m0000"
+
+    async def _handle(request: web.Request) -> web.StreamResponse:
+        return await relays.async_handle(
+            request, "m0000", lambda: api.get_mjpeg_stream_coro("m0000", stream_url)
+        )
+
+    app = web.Application()
+    app.router.add_get("/relay", _handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    upstream_before = server.stats.requests.get("mjpeg", 0)
+
+    frames = [0] * viewers
+    connected = asyncio.Event()
+
+    async def _view(index: int) -> None:
+        async with aiohttp.ClientSession() as client:
+            async with client.get(f"http://{host}:{port}/relay") as response:
+                async for chunk in response.content.iter_any():
+                    frames[index] += chunk.count(b"--shinobiframe")
+                    if index == viewers - 1:
+                        connected.set()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(_view(index)) for index in range(viewers)]
+    await asyncio.wait_for(connected.wait(), 10)
+    await asyncio.sleep(duration)
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    relays.close()
+    await runner.cleanup()
+
+    return {
+        "frames_per_second_per_viewer": statistics.mean(frames) / duration,
+        "upstream_connections": server.stats.requests.get("mjpeg", 0) - upstream_before,
+        # Includes the viewers' client sessions, so this is an upper bound
+        "memory_per_viewer_kb": memory / viewers / 1024,
+    }
+
+
+async def main() -> None:
+    """Run all benchmarks and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--monitors", type=int, default=80, help="simulated fleet size (10-1000)")
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of failed requests")
+    parser.add_argument("--churn", type=float, default=0.05, help="fraction of monitors changing per refresh")
+    parser.add_argument("--fps", type=float, default=10.0, help="MJPEG frame rate")
+    parser.add_argument("--viewers", type=int, default=10, help="concurrent viewers")
+    parser.add_argument("--cycles", type=int, default=20, help="refresh cycles")
+    parser.add_argument("--duration", type=float, default=5.0, help="MJPEG measurement time in seconds")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    server = FakeShinobi(
+        FakeShinobiConfig(
+            monitors=args.monitors,
+            latency=args.latency,
+            error_rate=args.error_rate,
+            churn=args.churn,
+            fps=args.fps,
+        )
+    )
+    await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        async with aiohttp.ClientSession() as session:
+            results = {
+                "refresh": await bench_refresh(hass, session, server, args.cycles),
+                "snapshots": await bench_snapshots(session, server, args.viewers, 3),
+                "mjpeg": await bench_mjpeg(session, server, args.viewers, args.duration),
+            }
+        await hass.async_stop(force=True)
+    await server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, values in results.items():
+        print(name)
+        for key, value in values.items():
+            print(f"  {key:32} {value:12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
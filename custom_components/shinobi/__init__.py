@@ -1,64 +1,183 @@
 """The Shinobi Video integration."""
 from __future__ import annotations
-from datetime import timedelta
 
+from functools import partial
 import logging
+from typing import Any
+from urllib.parse import urlparse
 
+import aiohttp
+
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_URL, CONF_API_KEY
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.const import CONF_URL, CONF_API_KEY, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.util.ssl import client_context
 
 from .api import ShinobiApi
-from .const import DOMAIN, CONF_GROUP_KEY, CONF_URL, CONF_API_KEY, CONF_VERIFY_SSL
+from .coordinator import ShinobiDataUpdateCoordinator
+from .events import async_handle_webhook
+from .health import ShinobiHealthCoordinator
+from .mjpeg import MjpegRelayManager
+from .models import Monitor
+from .prefetch import SnapshotPrefetcher
+from .recordings import RecordingIndex
+from .services import async_setup_services, async_unload_services
+from .timelapse import SnapshotBuffer, SnapshotCapture
+from .views import ShinobiVideoView
+from .const import (
+    DOMAIN,
+    CONF_GROUP_KEY,
+    CONF_URL,
+    CONF_API_KEY,
+    CONF_VERIFY_SSL,
+    CONF_SERVERS,
+    CONF_SNAPSHOT_TTL,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_PREFETCH_MONITORS,
+    CONF_PREFETCH_RATE,
+    CONF_HEDGE_SNAPSHOTS,
+    CONF_TIMELAPSE_INTERVAL,
+    CONF_TIMELAPSE_MEMORY,
+    DEFAULT_SNAPSHOT_TTL,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_PREFETCH_MONITORS,
+    DEFAULT_PREFETCH_RATE,
+    DEFAULT_HEDGE_SNAPSHOTS,
+    DEFAULT_TIMELAPSE_INTERVAL,
+    DEFAULT_TIMELAPSE_MEMORY,
+    API_CONNECTIONS_PER_HOST,
+    STREAM_CONNECTIONS_PER_HOST,
+    KEEPALIVE_TIMEOUT,
+    DNS_CACHE_TTL,
+    STORAGE_VERSION,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[str] = ["sensor", "camera", "switch"]
+DATA_VIEW_REGISTERED = f"{DOMAIN}_view_registered"
+
+PLATFORMS: list[str] = ["sensor", "binary_sensor", "camera", "switch", "select"]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Shinobi Video from a config entry."""
     _LOGGER.info("Setting up Shinobi Video integration for %s", entry.data.get(CONF_URL))
-    session = async_get_clientsession(hass)
-    api = ShinobiApi(
-        session,
-        entry.data[CONF_URL],
-        entry.data[CONF_API_KEY],
-        entry.data[CONF_GROUP_KEY],
-        entry.data.get(CONF_VERIFY_SSL, True),
+    # Shared by all servers, each request passes the SSL context of its server
+    session = _create_session(API_CONNECTIONS_PER_HOST)
+    stream_session = _create_session(STREAM_CONNECTIONS_PER_HOST)
+    # Closed when the entry unloads, and also when setup fails from here on
+    entry.async_on_unload(session.close)
+    entry.async_on_unload(stream_session.close)
+
+    # The primary server lives at the top of the entry data, extra servers
+    # or groups are listed under CONF_SERVERS
+    apis: dict[str, ShinobiApi] = {}
+    for index, server in enumerate([entry.data, *entry.data.get(CONF_SERVERS, [])]):
+        api = ShinobiApi(
+            session,
+            server[CONF_URL],
+            server[CONF_API_KEY],
+            server[CONF_GROUP_KEY],
+            server.get(CONF_VERIFY_SSL, True),
+            snapshot_ttl=entry.options.get(CONF_SNAPSHOT_TTL, DEFAULT_SNAPSHOT_TTL),
+            stream_session=stream_session,
+            hedge_snapshots=entry.options.get(CONF_HEDGE_SNAPSHOTS, DEFAULT_HEDGE_SNAPSHOTS),
+        )
+        apis["" if index == 0 else _server_id(api, server)] = api
+
+    coordinator = ShinobiDataUpdateCoordinator(
+        hass,
+        apis,
+        entry.options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN),
+        entry.options.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX),
+        store=_monitor_store(hass, entry),
     )
 
-    async def async_update_data():
-        """Fetch data from API endpoint."""
-        try:
-            monitors = await api.get_monitors()
-            _LOGGER.debug("Successfully refreshed data from Shinobi API")
-            # Shinobi returns a list of monitors. Convert to dict for easier lookup.
-            return {monitor["mid"]: monitor for monitor in monitors}
-        except Exception as err:
-            _LOGGER.error("Error communicating with Shinobi API: %s", err)
-            raise UpdateFailed(f"Error communicating with API: {err}")
-
-    coordinator = DataUpdateCoordinator(
+    if await coordinator.async_restore():
+        # Entities come up from the last known monitors, the live refresh
+        # reconciles them without holding up startup
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        # Fetch initial data so we have data when setting up platforms
+        await coordinator.async_config_entry_first_refresh()
+    coordinator.async_start_push()
+    entry.async_on_unload(
+        coordinator.async_add_listener(partial(_async_remove_deleted_devices, hass, entry, coordinator))
+    )
+    entry.async_on_unload(coordinator.async_stop_push)
+
+    if CONF_WEBHOOK_ID not in entry.data:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()}
+        )
+    webhook_id = entry.data[CONF_WEBHOOK_ID]
+    webhook.async_register(
         hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=30),
+        DOMAIN,
+        "Shinobi Video",
+        webhook_id,
+        partial(async_handle_webhook, coordinator),
+        allowed_methods=("GET", "POST"),
+    )
+    entry.async_on_unload(partial(webhook.async_unregister, hass, webhook_id))
+    _LOGGER.info(
+        "Point the Shinobi detection webhook at %s?mid={{MONITOR_ID}}&ke={{GROUP_KEY}}",
+        webhook.async_generate_path(webhook_id),
     )
 
-    # Fetch initial data so we have data when setting up platforms
-    await coordinator.async_config_entry_first_refresh()
+    mjpeg_relays = MjpegRelayManager()
+    entry.async_on_unload(mjpeg_relays.close)
 
+    prefetcher = SnapshotPrefetcher(
+        hass,
+        coordinator,
+        entry.options.get(CONF_PREFETCH_MONITORS, DEFAULT_PREFETCH_MONITORS),
+        entry.options.get(CONF_PREFETCH_RATE, DEFAULT_PREFETCH_RATE),
+    )
+    prefetcher.async_start()
+    entry.async_on_unload(prefetcher.async_stop)
+
+    # Every fetched snapshot feeds the buffer for contact sheets and timelapses
+    snapshots = SnapshotBuffer(
+        hass, entry.options.get(CONF_TIMELAPSE_MEMORY, DEFAULT_TIMELAPSE_MEMORY) * 1024 * 1024
+    )
+    for server_id, api in apis.items():
+        api.snapshot_cache.listener = lambda mid, image, server_id=server_id: snapshots.async_record(
+            Monitor.make_key(server_id, mid), image
+        )
+    entry.async_on_unload(
+        coordinator.async_add_listener(lambda: snapshots.async_remove(coordinator.removed_monitors))
+    )
+    capture = SnapshotCapture(
+        hass, coordinator, entry.options.get(CONF_TIMELAPSE_INTERVAL, DEFAULT_TIMELAPSE_INTERVAL)
+    )
+    capture.async_start()
+    entry.async_on_unload(capture.async_stop)
+
+    if not hass.data.get(DATA_VIEW_REGISTERED):
+        hass.http.register_view(ShinobiVideoView(hass))
+        hass.data[DATA_VIEW_REGISTERED] = True
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
-        "api": api,
         "coordinator": coordinator,
+        "mjpeg": mjpeg_relays,
+        "prefetch": prefetcher,
+        "snapshots": snapshots,
+        "recordings": RecordingIndex(coordinator),
+        # No first refresh, it polls once a bitrate sensor is enabled
+        "health": ShinobiHealthCoordinator(hass, coordinator),
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     _LOGGER.info("Successfully set up Shinobi Video integration")
     return True
@@ -67,6 +186,55 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        data["coordinator"].async_stop_push()
+        data["mjpeg"].close()
+        async_unload_services(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored monitor list of a deleted entry."""
+    await _monitor_store(hass, entry).async_remove()
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+@callback
+def _async_remove_deleted_devices(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: ShinobiDataUpdateCoordinator
+) -> None:
+    """Remove the devices, and with them the entities, of deleted monitors."""
+    if not coordinator.removed_monitors:
+        return
+    device_registry = dr.async_get(hass)
+    for key in coordinator.removed_monitors:
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, key)}):
+            _LOGGER.debug("Removing device of deleted monitor %s", key)
+            device_registry.async_update_device(device.id, remove_config_entry_id=entry.entry_id)
+
+
+def _monitor_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """Return the store holding the last good monitor list of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.monitors")
+
+
+def _create_session(limit_per_host: int) -> aiohttp.ClientSession:
+    """Create a connection pool dedicated to Shinobi traffic."""
+    connector = aiohttp.TCPConnector(
+        limit_per_host=limit_per_host,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        ssl=client_context(),
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+def _server_id(api: ShinobiApi, server: dict[str, Any]) -> str:
+    """Return a stable ID for an additional server or group."""
+    return f"{server[CONF_GROUP_KEY]}@{urlparse(api.url).netloc}"
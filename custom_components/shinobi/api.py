@@ -2,11 +2,133 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import partial
+import json
 import logging
+import time
+from typing import Any
+
 import aiohttp
 import async_timeout
 
+from homeassistant.util.ssl import client_context
+
+from .breaker import STATE_CLOSED, CircuitBreaker, CircuitOpenError
+from .models import json_loads, trim_monitor
+from .stats import ApiStats, CallResult
+from .trace import SampledLogger
+from .const import (
+    ADAPTIVE_MIN_SAMPLES,
+    DEFAULT_HEDGE_SNAPSHOTS,
+    DEFAULT_SNAPSHOT_TTL,
+    HEDGE_BUDGET,
+    HEDGE_BURST,
+    MODE_CHANGE_CONCURRENCY,
+    PUSH_INIT_TIMEOUT,
+    SNAPSHOT_CACHE_SIZE,
+    SCALED_SNAPSHOT_CACHE_SIZE,
+)
+
 _LOGGER = logging.getLogger(__name__)
+_TRACE = SampledLogger(_LOGGER)
+
+
+class SnapshotCache:
+    """Size-bounded snapshot cache with single-flight fetching.
+
+    Concurrent requests for the same key share one in-flight fetch and all
+    receive the same bytes object.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_SNAPSHOT_TTL, max_entries: int = SNAPSHOT_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self.ttl = ttl
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[bytes | None]] = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.refreshes = 0
+        # Called with the key and image of every newly fetched image
+        self.listener: Callable[[str, bytes], None] | None = None
+
+    def get(self, key: str) -> bytes | None:
+        """Return a cached image if it is still fresh."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        fetched, image = entry
+        if time.monotonic() - fetched > self.ttl:
+            return None
+        self._entries.move_to_end(key)
+        return image
+
+    def age(self, key: str) -> float | None:
+        """Return how many seconds ago an image was cached, if it is cached."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        return time.monotonic() - entry[0]
+
+    def set(self, key: str, image: bytes) -> None:
+        """Store an image, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic(), image)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def async_get(
+        self, key: str, fetch: Callable[[], Awaitable[bytes | None]], refresh: bool = False
+    ) -> bytes | None:
+        """Return a fresh image, fetching it at most once at a time per key.
+
+        With ``refresh`` a new image is fetched even if the cached one is fresh.
+        """
+        if not refresh and (image := self.get(key)) is not None:
+            self.hits += 1
+            return image
+
+        if (inflight := self._inflight.get(key)) is not None:
+            self.coalesced += 1
+        else:
+            if refresh:
+                self.refreshes += 1
+            else:
+                self.misses += 1
+            inflight = asyncio.ensure_future(fetch())
+            self._inflight[key] = inflight
+
+            def _done(fut: asyncio.Future[bytes | None]) -> None:
+                self._inflight.pop(key, None)
+                if not fut.cancelled() and fut.exception() is None and fut.result() is not None:
+                    self.set(key, fut.result())
+                    if self.listener is not None:
+                        self.listener(key, fut.result())
+
+            inflight.add_done_callback(_done)
+
+        # Shield so a viewer going away does not cancel the fetch for the others
+        return await asyncio.shield(inflight)
+
+    def clear(self) -> None:
+        """Drop all cached images."""
+        self._entries.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache statistics."""
+        requests = self.hits + self.coalesced + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": round((self.hits + self.coalesced) / requests, 3) if requests else None,
+        }
 
 
 class ShinobiApi:
@@ -19,17 +141,88 @@ class ShinobiApi:
         api_key: str,
         group_key: str,
         verify_ssl: bool = True,
+        snapshot_ttl: float = DEFAULT_SNAPSHOT_TTL,
+        stream_session: aiohttp.ClientSession | None = None,
+        hedge_snapshots: bool = DEFAULT_HEDGE_SNAPSHOTS,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        Long-lived MJPEG and websocket connections use ``stream_session`` when
+        given, so they cannot exhaust the pool used for API calls. With
+        ``hedge_snapshots`` a snapshot request slower than the usual p95 is
+        raced against a second one.
+        """
         self._session = session
+        self._stream_session = stream_session or session
         if not url.startswith(("http://", "https://")):
             url = f"http://{url}"
         self._url = url.rstrip("/")
         self._api_key = api_key
         self._group_key = group_key
         self._verify_ssl = verify_ssl
+        # Explicit per server, the shared connector may belong to a server
+        # with different settings
+        self._ssl = client_context() if verify_ssl else False
+        self.snapshot_cache = SnapshotCache(snapshot_ttl)
+        self.stats = ApiStats()
+        self.breaker = CircuitBreaker(f"Shinobi at {self._url}")
+        self._hedge_snapshots = hedge_snapshots
+        self._hedge_tokens = 0.0
+        # Bounds concurrent mode changes, however many monitors are queued
+        self._mode_semaphore = asyncio.Semaphore(MODE_CHANGE_CONCURRENCY)
+        # Last monitor list and its validators, for conditional requests
+        self._monitors: list[dict[str, Any]] | None = None
+        self._monitors_validators: dict[str, str] = {}
+        # Resolved stream URL per monitor, keyed on the streams entry it came from
+        self._stream_urls: dict[str, tuple[str | None, str]] = {}
+        self._scaled_images: OrderedDict[
+            tuple[str, int | None, int | None], tuple[bytes, asyncio.Future[bytes]]
+        ] = OrderedDict()
         _LOGGER.debug("Initialized Shinobi API client for %s", self._url)
 
+    @property
+    def url(self) -> str:
+        """Return the base URL of the Shinobi server."""
+        return self._url
+
+    @property
+    def group_key(self) -> str:
+        """Return the group key this client is bound to."""
+        return self._group_key
+
+    @asynccontextmanager
+    async def _request(self, endpoint: str) -> AsyncIterator[CallResult]:
+        """Guard a call with the circuit breaker, a timeout and statistics.
+
+        The timeout adapts to the latencies of the endpoint. Timeouts,
+        connection errors and 5xx answers count as failures of the server.
+        """
+        self.breaker.before_call()
+        try:
+            with self.stats.measure(endpoint) as call:
+                async with async_timeout.timeout(self.stats.endpoint(endpoint).timeout()):
+                    yield call
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+            self.breaker.record_failure()
+            raise
+        except aiohttp.ClientResponseError as err:
+            if err.status >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        except asyncio.CancelledError:
+            self.breaker.record_cancelled()
+            raise
+        except Exception:
+            # Answered, but not with what we expected
+            self.breaker.record_success()
+            raise
+        if call.status is not None and call.status >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
     async def test_connection(self) -> bool:
         """Test the connection to Shinobi."""
         _LOGGER.debug("Testing connection to Shinobi URL: %s", self._url)
@@ -43,39 +236,61 @@ class ShinobiApi:
             return False
 
     async def get_monitors(self) -> list[dict]:
-        """Get the list of monitors from Shinobi."""
+        """Get the list of monitors from Shinobi.
+
+        Monitors are trimmed to the fields the integration reads. When the
+        server answers a conditional request with 304 Not Modified, the
+        previous list object is returned as is.
+        """
         url = f"{self._url}/{self._api_key}/monitor/{self._group_key}"
         _LOGGER.debug("Fetching monitors from: %s", url)
+        headers = self._monitors_validators if self._monitors is not None else None
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, ssl=None if self._verify_ssl else False)
-                
-                if response.status == 401:
-                    raise Exception("Invalid API Key or Group Key (Unauthorized)")
-                if response.status == 403:
-                    raise Exception("Access denied (Forbidden). Check API Key restrictions.")
-                
-                response.raise_for_status()
-                
-                # Check content type to ensure it's JSON
-                if "application/json" not in response.headers.get("content-type", "").lower():
-                    text = await response.text()
-                    _LOGGER.error("Expected JSON but got: %s", text[:100])
-                    raise Exception("Server did not return JSON. Check the URL.")
-
-                data = await response.json()
-                
-                # Shinobi might return {"success": false, "msg": "..."} instead of status error
-                if isinstance(data, dict) and data.get("success") is False:
-                    _LOGGER.error("Shinobi API error: %s", data.get("msg", "Unknown error"))
-                    raise Exception(data.get("msg", "Unauthorized"))
-                
-                if not isinstance(data, list):
-                    _LOGGER.warning("Shinobi API returned non-list data: %s", data)
-                    return []
-                
-                _LOGGER.debug("Found %d monitors", len(data))
-                return data
+            async with self._request("monitors") as call:
+                async with self._session.get(url, headers=headers, ssl=self._ssl) as response:
+                    call.status = response.status
+                    if response.status == 401:
+                        raise Exception("Invalid API Key or Group Key (Unauthorized)")
+                    if response.status == 403:
+                        raise Exception("Access denied (Forbidden). Check API Key restrictions.")
+                    if response.status == 304 and self._monitors is not None:
+                        _LOGGER.debug("Monitor list not modified")
+                        return self._monitors
+
+                    response.raise_for_status()
+                    body = await response.read()
+                    call.size = len(body)
+                    validators = {
+                        request_header: response.headers[response_header]
+                        for response_header, request_header in (
+                            ("ETag", "If-None-Match"),
+                            ("Last-Modified", "If-Modified-Since"),
+                        )
+                        if response_header in response.headers
+                    }
+
+            try:
+                data = json_loads(body)
+            except ValueError:
+                _LOGGER.error("Expected JSON but got: %s", body[:100])
+                raise Exception("Server did not return JSON. Check the URL.")
+
+            # Shinobi might return {"success": false, "msg": "..."} instead of status error
+            if isinstance(data, dict) and data.get("success") is False:
+                _LOGGER.error("Shinobi API error: %s", data.get("msg", "Unknown error"))
+                raise Exception(data.get("msg", "Unauthorized"))
+
+            if not isinstance(data, list):
+                # Treating this as no monitors would delete every device
+                raise Exception(f"Expected a list of monitors, got {type(data).__name__}")
+
+            monitors = [trim_monitor(raw) for raw in data if isinstance(raw, dict) and "mid" in raw]
+            self._monitors = monitors
+            self._monitors_validators = validators
+            _LOGGER.debug("Found %d monitors", len(monitors))
+            return monitors
+        except CircuitOpenError:
+            raise
         except asyncio.TimeoutError:
             _LOGGER.error("Timeout connecting to Shinobi at %s", self._url)
             raise Exception("Connection timed out. Check the URL and network.")
@@ -93,12 +308,22 @@ class ShinobiApi:
     def get_mjpeg_stream_coro(self, monitor_id: str, stream_url: str):
         """Return the coroutine for the MJPEG stream."""
         url = self.get_stream_url(monitor_id, stream_url)
-        return self._session.get(url, ssl=None if self._verify_ssl else False)
+        return self._stream_session.get(
+            url,
+            ssl=self._ssl,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30),
+        )
 
     def get_stream_url(self, monitor_id: str, stream_url: str | None = None) -> str:
-        """Get the stream URL for a monitor. Use stream_url if available."""
-        _LOGGER.info("Generating stream URL for monitor %s. Provided URL: %s", monitor_id, stream_url)
-        
+        """Get the stream URL for a monitor. Use stream_url if available.
+
+        The result is cached until the monitor's ``streams`` entry changes; the
+        base URL is fixed for the lifetime of the client.
+        """
+        cached = self._stream_urls.get(monitor_id)
+        if cached is not None and cached[0] == stream_url:
+            return cached[1]
+
         if stream_url:
             if stream_url.startswith("/"):
                 res = f"{self._url}{stream_url}"
@@ -107,18 +332,104 @@ class ShinobiApi:
         else:
             # Fallback to default HLS path if no stream_url provided
             res = f"{self._url}/{self._api_key}/hls/{self._group_key}/{monitor_id}/index.m3u8"
-            
-        _LOGGER.info("Final stream URL for %s: %s", monitor_id, res)
+
+        self._stream_urls[monitor_id] = (stream_url, res)
+        _TRACE("Resolved stream URL for %s: %s", monitor_id, res)
         return res
 
-    async def async_get_camera_image(self, monitor_id: str) -> bytes | None:
+    async def async_get_camera_image(
+        self, monitor_id: str, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return a still image from the camera, served from cache when fresh.
+
+        When ``width`` or ``height`` is given the image is downscaled to fit.
+        """
+        image = await self.snapshot_cache.async_get(
+            monitor_id, lambda: self._async_fetch_camera_image(monitor_id)
+        )
+        if image is None or (not width and not height):
+            return image
+        return await self._async_scale_image(monitor_id, image, width, height)
+
+    async def async_refresh_camera_image(self, monitor_id: str) -> bytes | None:
+        """Fetch a new still image into the cache ahead of a viewer asking for it."""
+        return await self.snapshot_cache.async_get(
+            monitor_id, lambda: self._async_fetch_camera_image(monitor_id), refresh=True
+        )
+
+    async def _async_scale_image(
+        self, monitor_id: str, image: bytes, width: int | None, height: int | None
+    ) -> bytes:
+        """Downscale a snapshot in the executor, once per source image and size."""
+        # Shinobi has no per-request scaled snapshot endpoint, so scale locally
+        key = (monitor_id, width, height)
+        entry = self._scaled_images.get(key)
+        if entry is None or entry[0] is not image:
+            future = asyncio.get_running_loop().run_in_executor(
+                None, _scale_jpeg, image, width, height
+            )
+            entry = (image, future)
+            self._scaled_images[key] = entry
+            while len(self._scaled_images) > SCALED_SNAPSHOT_CACHE_SIZE:
+                self._scaled_images.popitem(last=False)
+        self._scaled_images.move_to_end(key)
+
+        try:
+            return await asyncio.shield(entry[1])
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not scale image for %s: %s", monitor_id, err)
+            return image
+
+    async def _async_fetch_camera_image(self, monitor_id: str) -> bytes | None:
+        """Fetch a still image, hedging requests slower than the usual p95.
+
+        Snapshots are idempotent reads, so when the first request takes longer
+        than 95% of recent ones a second is sent and the first answer wins.
+        Every fetch earns HEDGE_BUDGET of a hedge, so a server that is slow
+        across the board never sees its snapshot load doubled.
+        """
+        first = asyncio.ensure_future(self._async_fetch_snapshot(monitor_id))
+        delay = None
+        if self._hedge_snapshots:
+            self._hedge_tokens = min(self._hedge_tokens + HEDGE_BUDGET, HEDGE_BURST)
+            delay = self.stats.endpoint("snapshot").percentile(95, ADAPTIVE_MIN_SAMPLES)
+        if delay is None:
+            return await first
+
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done and self.breaker.state == STATE_CLOSED and self._hedge_tokens >= 1:
+                self._hedge_tokens -= 1
+                _TRACE("Hedging snapshot request for %s after %.3fs", monitor_id, delay)
+                pending.add(asyncio.ensure_future(self._async_fetch_snapshot(monitor_id)))
+            while True:
+                for task in done:
+                    if (image := task.result()) is not None:
+                        return image
+                if not pending:
+                    return None
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _async_fetch_snapshot(self, monitor_id: str) -> bytes | None:
         """Fetch a still image from the camera."""
         url = self.get_snapshot_url(monitor_id)
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, ssl=None if self._verify_ssl else False)
-                if response.status == 200:
-                    return await response.read()
+            async with self._request("snapshot") as call:
+                async with self._session.get(url, ssl=self._ssl) as response:
+                    call.status = response.status
+                    if response.status == 200:
+                        image = await response.read()
+                        call.size = len(image)
+                        return image
+                    call.failed = True
+        except CircuitOpenError:
+            pass
         except Exception as err:
             _LOGGER.error("Error fetching camera image for %s: %s", monitor_id, err)
         return None
@@ -128,13 +439,176 @@ class ShinobiApi:
         url = f"{self._url}/{self._api_key}/monitor/{self._group_key}/{monitor_id}/{mode}"
         _LOGGER.info("Changing mode for monitor %s to %s", monitor_id, mode)
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, ssl=None if self._verify_ssl else False)
-                if response.status == 200:
-                    _LOGGER.info("Successfully changed mode for monitor %s to %s", monitor_id, mode)
-                    return True
-                _LOGGER.error("Error changing mode for %s to %s: HTTP %s", monitor_id, mode, response.status)
+            async with self._mode_semaphore, self._request("mode") as call:
+                async with self._session.get(url, ssl=self._ssl) as response:
+                    call.status = response.status
+                    if response.status == 200:
+                        _LOGGER.info("Successfully changed mode for monitor %s to %s", monitor_id, mode)
+                        return True
+                    call.failed = True
+                    _LOGGER.error("Error changing mode for %s to %s: HTTP %s", monitor_id, mode, response.status)
         except Exception as err:
             _LOGGER.error("Exception while changing mode for %s to %s: %s", monitor_id, mode, err)
         return False
 
+    async def async_get_videos(
+        self,
+        monitor_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get the recordings of a monitor, newest first, within a time range."""
+        url = f"{self._url}/{self._api_key}/videos/{self._group_key}/{monitor_id}"
+        params = {}
+        if start:
+            params["start"] = _format_time(start)
+        if end:
+            params["end"] = _format_time(end)
+        if limit:
+            params["limit"] = str(limit)
+        _LOGGER.debug("Fetching videos for %s: %s", monitor_id, params)
+        try:
+            async with self._request("videos") as call:
+                async with self._session.get(url, params=params, ssl=self._ssl) as response:
+                    call.status = response.status
+                    response.raise_for_status()
+                    call.size = response.content_length or 0
+                    data = await response.json(content_type=None)
+        except asyncio.TimeoutError:
+            raise Exception("Connection timed out. Check the URL and network.")
+
+        if isinstance(data, dict) and data.get("success") is False:
+            raise Exception(data.get("msg", "Unauthorized"))
+        videos = data.get("videos") if isinstance(data, dict) else None
+        return videos if isinstance(videos, list) else []
+
+    def get_video_coro(self, monitor_id: str, filename: str, headers: dict[str, str] | None = None):
+        """Return the request for a recording, passing e.g. Range headers on."""
+        url = f"{self._url}/{self._api_key}/videos/{self._group_key}/{monitor_id}/{filename}"
+        return self._stream_session.get(
+            url,
+            headers=headers,
+            ssl=self._ssl,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30),
+        )
+
+    def get_websocket_url(self) -> str:
+        """Get the Socket.IO websocket URL of the Shinobi server."""
+        # http -> ws, https -> wss
+        return f"ws{self._url[4:]}/socket.io/?EIO=3&transport=websocket"
+
+    async def async_listen(
+        self,
+        on_event: Callable[[dict[str, Any]], None],
+        on_connect: Callable[[], None] | None = None,
+    ) -> None:
+        """Listen to the Shinobi websocket feed until the connection drops.
+
+        Shinobi speaks Socket.IO (Engine.IO protocol 3). Every ``f`` event the
+        server pushes for the group is handed to ``on_event``. ``on_connect``
+        is only called once Shinobi answers the init, so a rejected key never
+        counts as connected; without an answer within PUSH_INIT_TIMEOUT the
+        connection is closed.
+        """
+        url = self.get_websocket_url()
+        _LOGGER.debug("Connecting to Shinobi websocket at %s", self._url)
+        ping_task: asyncio.Task | None = None
+        init_timer: asyncio.TimerHandle | None = None
+        initialized = False
+        try:
+            async with self._stream_session.ws_connect(
+                url, ssl=self._ssl, heartbeat=None
+            ) as ws:
+                async for msg in ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        if msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+                        continue
+
+                    packet: str = msg.data
+                    if packet.startswith("0"):
+                        # Engine.IO open; the client is responsible for pinging
+                        handshake = json.loads(packet[1:])
+                        interval = handshake.get("pingInterval", 25000) / 1000
+                        ping_task = asyncio.create_task(self._async_ping(ws, interval))
+                    elif packet == "2":
+                        await ws.send_str("3")
+                    elif packet.startswith("40"):
+                        # Socket.IO connected, authenticate against the group
+                        await ws.send_str(
+                            "42"
+                            + json.dumps(
+                                [
+                                    "f",
+                                    {
+                                        "f": "init",
+                                        "ke": self._group_key,
+                                        "auth": self._api_key,
+                                        "uid": "",
+                                    },
+                                ]
+                            )
+                        )
+                        init_timer = asyncio.get_running_loop().call_later(
+                            PUSH_INIT_TIMEOUT, partial(self._init_timed_out, ws)
+                        )
+                    elif packet.startswith("42"):
+                        try:
+                            name, payload = json.loads(packet[2:])[:2]
+                        except ValueError:
+                            continue
+                        if name != "f" or not isinstance(payload, dict):
+                            continue
+                        if not initialized:
+                            # The init answer, or any group event, means we are in
+                            initialized = True
+                            if init_timer:
+                                init_timer.cancel()
+                            _LOGGER.debug("Connected to Shinobi websocket at %s", self._url)
+                            if on_connect:
+                                on_connect()
+                        on_event(payload)
+                    elif packet.startswith("1") or packet.startswith("41"):
+                        break
+        finally:
+            if ping_task:
+                ping_task.cancel()
+            if init_timer:
+                init_timer.cancel()
+        _LOGGER.debug("Shinobi websocket at %s disconnected", self._url)
+
+    def _init_timed_out(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Drop a websocket Shinobi never answered, the API key was likely rejected."""
+        _LOGGER.debug("Shinobi did not answer the websocket init at %s, closing", self._url)
+        asyncio.create_task(ws.close())
+
+    @staticmethod
+    async def _async_ping(ws: aiohttp.ClientWebSocketResponse, interval: float) -> None:
+        """Keep the Engine.IO session alive."""
+        while not ws.closed:
+            await asyncio.sleep(interval)
+            try:
+                await ws.send_str("2")
+            except (ConnectionResetError, RuntimeError):
+                return
+
+
+def _format_time(value: datetime) -> str:
+    """Format a time for the videos API, which reads naive times as server local time."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _scale_jpeg(image: bytes, width: int | None, height: int | None) -> bytes:
+    """Downscale a JPEG to fit the requested size using TurboJPEG."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.camera import Image
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.camera.img_util import scale_jpeg_camera_image
+
+    # A missing dimension is bounded by the one we were given
+    return scale_jpeg_camera_image(
+        Image("image/jpeg", image), width or height, height or width
+    )
@@ -0,0 +1,130 @@
+"""Binary sensor platform for Shinobi Video."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, EVENT_MOTION_TIMEOUT, EVENT_DEBOUNCE
+from .entity import ShinobiEntity, async_add_monitor_entities
+from .models import DetectionEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the binary sensor platform."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+
+    async_add_monitor_entities(
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda monitor: [ShinobiMotionSensor(coordinator, monitor), ShinobiObjectSensor(coordinator, monitor)],
+    )
+
+
+class ShinobiMotionSensor(ShinobiEntity, BinarySensorEntity):
+    """A binary sensor that turns on when Shinobi detects something.
+
+    Detections arrive from the webhook or the websocket. The sensor turns off
+    EVENT_MOTION_TIMEOUT seconds after the last one; detections while it is
+    on only extend that timer instead of writing state. Repeats of the same
+    detection within EVENT_DEBOUNCE seconds are dropped altogether.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.MOTION
+    _attr_is_on = False
+
+    def __init__(self, coordinator, monitor) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, monitor)
+        self._attr_name = f"{monitor.name} Motion"
+        self._attr_unique_id = f"shinobi_{self._monitor_key}_motion"
+        self._attr_extra_state_attributes = {}
+        self._last_event = -EVENT_DEBOUNCE
+        self._unsub_reset: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to detection events."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, self.coordinator.event_signal, self._handle_event)
+        )
+        self.async_on_remove(self._cancel_reset)
+
+    def _matches(self, event: DetectionEvent) -> bool:
+        """Return true if the event turns this sensor on."""
+        return True
+
+    def _event_attributes(self, event: DetectionEvent) -> dict[str, Any]:
+        """Return the state attributes describing an event."""
+        return {"reason": event.reason}
+
+    @callback
+    def _handle_event(self, key: str, event: DetectionEvent) -> None:
+        """Handle a detection for any monitor."""
+        if key != self._monitor_key or not self._matches(event):
+            return
+
+        now = time.monotonic()
+        attributes = self._event_attributes(event)
+        changed = attributes != self._attr_extra_state_attributes
+        if self._attr_is_on and not changed and now - self._last_event < EVENT_DEBOUNCE:
+            return
+        self._last_event = now
+
+        self._cancel_reset()
+        self._unsub_reset = async_call_later(self.hass, EVENT_MOTION_TIMEOUT, self._async_reset)
+        if self._attr_is_on and not changed:
+            return
+        self._attr_extra_state_attributes = attributes
+        self._attr_is_on = True
+        self.async_write_ha_state()
+
+    @callback
+    def _async_reset(self, _now: Any) -> None:
+        """Turn off after the last detection timed out."""
+        self._unsub_reset = None
+        self._attr_is_on = False
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_reset(self) -> None:
+        """Cancel a pending turn-off."""
+        if self._unsub_reset is not None:
+            self._unsub_reset()
+            self._unsub_reset = None
+
+
+class ShinobiObjectSensor(ShinobiMotionSensor):
+    """A binary sensor that turns on when Shinobi detects an object."""
+
+    _attr_device_class = BinarySensorDeviceClass.OCCUPANCY
+
+    def __init__(self, coordinator, monitor) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, monitor)
+        self._attr_name = f"{monitor.name} Object"
+        self._attr_unique_id = f"shinobi_{self._monitor_key}_object"
+        self._attr_extra_state_attributes = {"objects": []}
+
+    def _matches(self, event: DetectionEvent) -> bool:
+        """Return true if the event names detected objects."""
+        return bool(event.objects)
+
+    def _event_attributes(self, event: DetectionEvent) -> dict[str, Any]:
+        """Return the reason and the detected objects."""
+        return {"reason": event.reason, "objects": sorted(event.objects)}
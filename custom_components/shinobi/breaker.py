@@ -0,0 +1,87 @@
+"""Circuit breaker for the Shinobi Video API client."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from .const import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a Shinobi server that is not responding."""
+
+
+class CircuitBreaker:
+    """Fail fast while a Shinobi server is not responding.
+
+    After ``threshold`` consecutive failures the circuit opens and calls fail
+    immediately. Once ``reset_timeout`` seconds have passed a single probe
+    call is let through: if it succeeds the circuit closes, otherwise it
+    opens again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._name = name
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._opened = 0.0
+        self._probing = False
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through."""
+        if self.state == STATE_CLOSED:
+            return
+        if self.state == STATE_OPEN and time.monotonic() - self._opened >= self._reset_timeout:
+            self.state = STATE_HALF_OPEN
+        if self.state == STATE_HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(f"{self._name} is not responding, not calling it for now")
+
+    def record_success(self) -> None:
+        """Record a call that got an answer."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s is responding again", self._name)
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a call that timed out or failed on the server side."""
+        self._failures += 1
+        self._probing = False
+        if self.state == STATE_HALF_OPEN or self._failures >= self._threshold:
+            if self.state == STATE_CLOSED:
+                _LOGGER.warning(
+                    "%s failed %d times in a row, pausing calls for %ss",
+                    self._name,
+                    self._failures,
+                    self._reset_timeout,
+                )
+            self.state = STATE_OPEN
+            self._opened = time.monotonic()
+
+    def record_cancelled(self) -> None:
+        """Record a call that was abandoned before it had a result."""
+        self._probing = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the circuit."""
+        return {"state": self.state, "consecutive_failures": self._failures, "rejected": self.rejected}
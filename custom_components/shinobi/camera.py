@@ -1,13 +1,17 @@
 from typing import Any
 from aiohttp import web
 from homeassistant.components.camera import Camera, CameraEntityFeature
-from homeassistant.helpers.aiohttp_client import async_aiohttp_proxy_web
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    STREAM_PROFILE_AUTO,
+    STREAM_PROFILE_SHINOBI,
+)
+from .entity import ShinobiEntity, async_add_monitor_entities
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,53 +23,37 @@ async def async_setup_entry(
 ) -> None:
     """Set up the camera platform."""
     data = hass.data[DOMAIN][entry.entry_id]
-    api = data["api"]
     coordinator = data["coordinator"]
+    mjpeg_relays = data["mjpeg"]
+    prefetcher = data["prefetch"]
 
-    monitors_dict = coordinator.data
-    if not monitors_dict:
-        _LOGGER.warning("No monitors found to set up camera entities")
-        return
+    async_add_monitor_entities(
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda monitor: [ShinobiCamera(coordinator, coordinator.get_api(monitor), mjpeg_relays, prefetcher, monitor)],
+    )
 
-    _LOGGER.debug("Setting up %d camera entities", len(monitors_dict))
 
-    entities = []
-    for mid, monitor in monitors_dict.items():
-        if monitor.get("status") != "Stopped":
-            entities.append(ShinobiCamera(coordinator, api, monitor))
-
-    async_add_entities(entities)
-
-
-class ShinobiCamera(CoordinatorEntity, Camera):
+class ShinobiCamera(ShinobiEntity, Camera):
     """Representation of a Shinobi Video camera."""
 
-    def __init__(self, coordinator, api, monitor) -> None:
+    def __init__(self, coordinator, api, mjpeg_relays, prefetcher, monitor) -> None:
         """Initialize the camera."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, monitor)
         Camera.__init__(self)
         self._api = api
-        self._monitor_id = monitor["mid"]
-        
-        # Derive stream_type from details.stream_type in the JSON response
-        details = monitor.get("details", {})
-        if isinstance(details, str):
-            import json
-            try:
-                details = json.loads(details)
-            except:
-                details = {}
-        
-        self._stream_type = details.get("stream_type", "hls")
-        self._streams = monitor.get("streams", [])
-        self._stream_url = self._streams[0] if self._streams else None
+        self._mjpeg_relays = mjpeg_relays
+        self._prefetcher = prefetcher
         
-        _LOGGER.info("Stream URL for monitor %s (%s): %s", self._monitor_id, monitor.get("name"), self._stream_url)
-        
-        self._attr_name = monitor["name"]
-        self._attr_unique_id = f"shinobi_{self._monitor_id}"
+        # stream_type comes from details.stream_type in the JSON response
+        self._stream_type = monitor.stream_type
+        self._stream_url = monitor.stream_url
+
+        self._attr_name = monitor.name
+        self._attr_unique_id = f"shinobi_{self._monitor_key}"
         self._attr_brand = "Shinobi"
-        self._attr_model = monitor.get("type", "Unknown")
+        self._attr_model = monitor.type or "Unknown"
 
         _LOGGER.debug(
             "Initialized camera %s (id: %s) with stream type: %s",
@@ -73,36 +61,54 @@ class ShinobiCamera(CoordinatorEntity, Camera):
             self._monitor_id,
             self._stream_type,
         )
-        
-        if self._stream_type in ("hls", "rtsp", "webrtc", "mp4"):
-            self._attr_supported_features = CameraEntityFeature.STREAM
-        else:
-            self._attr_supported_features = CameraEntityFeature(0)
+
+    async def async_added_to_hass(self) -> None:
+        """Follow stream profile changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.coordinator.stream_profile_signal, self._async_stream_profile_changed
+            )
+        )
+
+    @callback
+    def _async_stream_profile_changed(self, key: str) -> None:
+        """Point a running stream at the newly selected source."""
+        if key == self._monitor_key:
+            self._async_update_stream_source()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Follow changes of the camera's sources in Shinobi."""
+        if self._monitor_key in self.coordinator.changed_monitors:
+            self._async_update_stream_source()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_update_stream_source(self) -> None:
+        """Restart a running stream if its source changed."""
+        if self.stream and (source := self._resolve_stream_source()) and source != self.stream.source:
+            self.stream.update_source(source)
+
+    @property
+    def supported_features(self) -> CameraEntityFeature:
+        """Stream only when the monitor offers a stream profile."""
+        if (monitor := self.monitor) and monitor.stream_profiles:
+            return CameraEntityFeature.STREAM
+        return CameraEntityFeature(0)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
-        monitor = self.coordinator.data.get(self._monitor_id)
-        if monitor:
-            extra_attributes = {
-                "mid": monitor.get("mid"),
-                "type": monitor.get("type"),
-            }
-            
-            # Derive stream_url similar to sensor.py
-            streams = monitor.get("streams", [])
-            if streams and isinstance(streams, list):
-                extra_attributes["stream_url"] = streams[0]
-            
-            return extra_attributes
+        if monitor := self.monitor:
+            return monitor.attributes
         return {}
 
     @property
     def is_recording(self) -> bool:
         """Return true if the device is recording."""
-        monitor = self.coordinator.data.get(self._monitor_id)
-        if monitor:
-            return monitor.get("mode") == "record"
+        if monitor := self.monitor:
+            return monitor.is_recording
         return False
 
     @property
@@ -114,22 +120,37 @@ class ShinobiCamera(CoordinatorEntity, Camera):
         self, width: int | None = None, height: int | None = None
     ) -> bytes | None:
         """Return a still image response from the camera."""
-        return await self._api.async_get_camera_image(self._monitor_id)
+        self._prefetcher.record_view(self._monitor_key)
+        return await self._api.async_get_camera_image(self._monitor_id, width, height)
 
     async def stream_source(self) -> str | None:
         """Return the source of the stream."""
-        if self._stream_type not in ("hls", "rtsp", "webrtc", "mp4"):
+        if not self.supported_features & CameraEntityFeature.STREAM:
             return None
         
-        monitor = self.coordinator.data.get(self._monitor_id)
-        stream_url = None
-        if monitor and monitor.get("streams"):
-            stream_url = monitor["streams"][0]
-            _LOGGER.debug("Found stream URL in monitor data for %s: %s", self._monitor_id, stream_url)
-            
-        res = self._api.get_stream_url(self._monitor_id, stream_url)
-        _LOGGER.debug("Stream source for %s: %s", self._attr_name, res)
-        return res
+        return self._resolve_stream_source()
+
+    def _resolve_stream_source(self) -> str | None:
+        """Pick the source for the stream component.
+
+        Auto keeps to Shinobi's own stream: Home Assistant may not be able to
+        reach the camera itself. The camera's RTSP streams are opt-in, and
+        fall back to Shinobi's stream when no longer available.
+        """
+        if (monitor := self.monitor) is None:
+            return None
+        profile = self.coordinator.stream_profiles.get(self._monitor_key, STREAM_PROFILE_AUTO)
+        if profile == STREAM_PROFILE_AUTO:
+            candidates = (STREAM_PROFILE_SHINOBI,)
+        else:
+            candidates = (profile, STREAM_PROFILE_SHINOBI)
+        for candidate in candidates:
+            if candidate == STREAM_PROFILE_SHINOBI:
+                if monitor.supports_stream:
+                    return self._api.get_stream_url(self._monitor_id, monitor.stream_url)
+            elif source := monitor.direct_sources.get(candidate):
+                return source
+        return None
 
     async def handle_async_mjpeg_stream(
         self, request: web.Request
@@ -138,5 +159,9 @@ class ShinobiCamera(CoordinatorEntity, Camera):
         if self._stream_type != "mjpeg":
             return await super().handle_async_mjpeg_stream(request)
 
-        stream_coro = self._api.get_mjpeg_stream_coro(self._monitor_id, self._stream_url)
-        return await async_aiohttp_proxy_web(self.hass, request, stream_coro)
+        # All viewers of this monitor share a single upstream connection
+        return await self._mjpeg_relays.async_handle(
+            request,
+            self._monitor_key,
+            lambda: self._api.get_mjpeg_stream_coro(self._monitor_id, self._stream_url),
+        )
@@ -7,13 +7,38 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .api import ShinobiApi
-from .const import DOMAIN, CONF_URL, CONF_API_KEY, CONF_GROUP_KEY, CONF_VERIFY_SSL
+from .const import (
+    DOMAIN,
+    CONF_URL,
+    CONF_API_KEY,
+    CONF_GROUP_KEY,
+    CONF_VERIFY_SSL,
+    CONF_SERVERS,
+    CONF_ADD_SERVER,
+    CONF_SNAPSHOT_TTL,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_PREFETCH_MONITORS,
+    CONF_PREFETCH_RATE,
+    CONF_HEDGE_SNAPSHOTS,
+    CONF_TIMELAPSE_INTERVAL,
+    CONF_TIMELAPSE_MEMORY,
+    DEFAULT_SNAPSHOT_TTL,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_PREFETCH_MONITORS,
+    DEFAULT_PREFETCH_RATE,
+    DEFAULT_HEDGE_SNAPSHOTS,
+    DEFAULT_TIMELAPSE_INTERVAL,
+    DEFAULT_TIMELAPSE_MEMORY,
+    TIMELAPSE_MIN_SPACING,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,6 +48,7 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Required(CONF_API_KEY): cv.string,
         vol.Required(CONF_GROUP_KEY): cv.string,
         vol.Optional(CONF_VERIFY_SSL, default=True): cv.boolean,
+        vol.Optional(CONF_ADD_SERVER, default=False): cv.boolean,
     }
 )
 
@@ -59,6 +85,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._data: dict[str, Any] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -80,12 +118,119 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception")
             errors["base"] = "unknown"
         else:
-            return self.async_create_entry(title=info["title"], data=user_input)
+            add_server = user_input.pop(CONF_ADD_SERVER, False)
+            self._data = user_input
+            if add_server:
+                return await self.async_step_server()
+            return self.async_create_entry(title=info["title"], data=self._data)
 
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
 
+    async def async_step_server(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle an additional Shinobi server or group."""
+        if user_input is None:
+            return self.async_show_form(
+                step_id="server", data_schema=STEP_USER_DATA_SCHEMA
+            )
+
+        errors = {}
+        servers = [self._data, *self._data.get(CONF_SERVERS, [])]
+
+        if any(
+            server[CONF_URL] == user_input[CONF_URL]
+            and server[CONF_GROUP_KEY] == user_input[CONF_GROUP_KEY]
+            for server in servers
+        ):
+            errors["base"] = "duplicate_server"
+        else:
+            try:
+                info = await validate_input(self.hass, user_input)
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+            else:
+                add_server = user_input.pop(CONF_ADD_SERVER, False)
+                self._data.setdefault(CONF_SERVERS, []).append(user_input)
+                if add_server:
+                    return await self.async_step_server()
+                return self.async_create_entry(title=info["title"], data=self._data)
+
+        return self.async_show_form(
+            step_id="server", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Shinobi Video options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            interval = user_input.get(CONF_TIMELAPSE_INTERVAL, 0)
+            if 0 < interval < TIMELAPSE_MIN_SPACING:
+                # The buffer keeps one snapshot per TIMELAPSE_MIN_SPACING at most
+                errors[CONF_TIMELAPSE_INTERVAL] = "timelapse_interval_too_short"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input or self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_SNAPSHOT_TTL,
+                        default=options.get(CONF_SNAPSHOT_TTL, DEFAULT_SNAPSHOT_TTL),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=300)),
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL_MIN,
+                        default=options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL_MAX,
+                        default=options.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                    vol.Optional(
+                        CONF_PREFETCH_MONITORS,
+                        default=options.get(CONF_PREFETCH_MONITORS, DEFAULT_PREFETCH_MONITORS),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_PREFETCH_RATE,
+                        default=options.get(CONF_PREFETCH_RATE, DEFAULT_PREFETCH_RATE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+                    vol.Optional(
+                        CONF_HEDGE_SNAPSHOTS,
+                        default=options.get(CONF_HEDGE_SNAPSHOTS, DEFAULT_HEDGE_SNAPSHOTS),
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_TIMELAPSE_INTERVAL,
+                        default=options.get(CONF_TIMELAPSE_INTERVAL, DEFAULT_TIMELAPSE_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_TIMELAPSE_MEMORY,
+                        default=options.get(CONF_TIMELAPSE_MEMORY, DEFAULT_TIMELAPSE_MEMORY),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1024)),
+                }
+            ),
+            errors=errors,
+            description_placeholders={"min_spacing": str(TIMELAPSE_MIN_SPACING)},
+        )
+
 
 class CannotConnect(Exception):
     """Error to indicate we cannot connect."""
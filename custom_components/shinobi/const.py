@@ -6,3 +6,133 @@ CONF_API_KEY = "api_key"
 CONF_GROUP_KEY = "group_key"
 CONF_VERIFY_SSL = "verify_ssl"
 CONF_STREAM_TYPE = "stream_type"
+CONF_SERVERS = "servers"
+CONF_ADD_SERVER = "add_server"
+CONF_SNAPSHOT_TTL = "snapshot_ttl"
+CONF_SCAN_INTERVAL_MIN = "scan_interval_min"
+CONF_SCAN_INTERVAL_MAX = "scan_interval_max"
+CONF_PREFETCH_MONITORS = "prefetch_monitors"
+CONF_PREFETCH_RATE = "prefetch_rate"
+CONF_HEDGE_SNAPSHOTS = "hedge_snapshots"
+CONF_TIMELAPSE_INTERVAL = "timelapse_interval"
+CONF_TIMELAPSE_MEMORY = "timelapse_memory"
+
+DEFAULT_SCAN_INTERVAL = 30
+# Adaptive polling: poll quickly after changes, slow down while quiet
+DEFAULT_SCAN_INTERVAL_MIN = 10
+DEFAULT_SCAN_INTERVAL_MAX = 120
+SCAN_INTERVAL_QUIET_FACTOR = 1.5
+SCAN_INTERVAL_JITTER = 0.1
+# Seconds to keep polling at the minimum interval after a mode command
+SCAN_INTERVAL_COMMAND_PERIOD = 60
+ERROR_BACKOFF_MAX = 600
+# Safety-net poll used while the websocket feed is connected
+PUSH_SCAN_INTERVAL = 300
+PUSH_RECONNECT_MAX = 300
+# Seconds to wait for Shinobi to answer the websocket init before giving up
+PUSH_INIT_TIMEOUT = 10
+
+DEFAULT_SNAPSHOT_TTL = 5
+SNAPSHOT_CACHE_SIZE = 128
+SCALED_SNAPSHOT_CACHE_SIZE = 256
+
+# Snapshot prefetching for the most viewed monitors, off by default
+DEFAULT_PREFETCH_MONITORS = 0
+DEFAULT_PREFETCH_RATE = 1.0
+PREFETCH_CONCURRENCY = 2
+# Views count half as much after this many seconds
+PREFETCH_VIEW_HALF_LIFE = 600
+PREFETCH_MIN_VIEWS = 0.5
+# Refresh a hot snapshot once it has used up this much of its TTL
+PREFETCH_REFRESH_AGE = 0.8
+
+# A second snapshot request is sent when the first is slower than the p95
+DEFAULT_HEDGE_SNAPSHOTS = True
+# Hedges are limited to this share of snapshot fetches, with a small burst
+HEDGE_BUDGET = 0.05
+HEDGE_BURST = 2
+
+# Per-endpoint timeouts follow the observed p99 latency within these bounds
+REQUEST_TIMEOUT_MIN = 2
+REQUEST_TIMEOUT_MAX = 10
+REQUEST_TIMEOUT_P99_FACTOR = 3
+# Samples needed before timeouts and hedging adapt to the latencies
+ADAPTIVE_MIN_SAMPLES = 20
+
+# Consecutive failures that open the circuit to a server, and seconds
+# until a probe request is let through
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30
+
+# Downsampled snapshots kept for contact sheets and timelapses. By default
+# only snapshots fetched anyway are kept; an interval captures all monitors.
+DEFAULT_TIMELAPSE_INTERVAL = 0
+DEFAULT_TIMELAPSE_MEMORY = 32  # MB
+TIMELAPSE_WINDOW = 3600
+TIMELAPSE_MIN_SPACING = 30
+TIMELAPSE_FRAME_SIZE = (320, 180)
+TIMELAPSE_MAX_FRAMES = 120
+TIMELAPSE_CONTACT_SHEET_COLUMNS = 8
+TIMELAPSE_CAPTURE_CONCURRENCY = 4
+TIMELAPSE_MEDIA_DIR = "shinobi"
+
+MODE_CHANGE_CONCURRENCY = 8
+# Shinobi monitor modes
+MODES = ("start", "record", "stop")
+
+# Where a camera's stream comes from: the camera's own RTSP main or
+# substream, or the stream Shinobi serves. Auto picks the cheapest.
+STREAM_PROFILE_AUTO = "auto"
+STREAM_PROFILE_SUBSTREAM = "substream"
+STREAM_PROFILE_RTSP = "rtsp"
+STREAM_PROFILE_SHINOBI = "shinobi"
+STREAM_PROFILES = (STREAM_PROFILE_SUBSTREAM, STREAM_PROFILE_RTSP, STREAM_PROFILE_SHINOBI)
+
+SERVICE_SET_MODE = "set_mode"
+ATTR_MODE = "mode"
+ATTR_MONITOR_IDS = "monitor_ids"
+
+SERVICE_CREATE_SNAPSHOT_SUMMARY = "create_snapshot_summary"
+ATTR_FORMAT = "format"
+ATTR_MINUTES = "minutes"
+ATTR_PER_MONITOR = "per_monitor"
+ATTR_FPS = "fps"
+FORMAT_CONTACT_SHEET = "contact_sheet"
+FORMAT_TIMELAPSE = "timelapse"
+
+# Connection pools owned by each config entry
+API_CONNECTIONS_PER_HOST = 8
+STREAM_CONNECTIONS_PER_HOST = 100
+KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+
+# How long a poll waits for slow servers before publishing the others
+SERVER_POLL_DEADLINE = 5
+# Polls in a row a monitor must be missing from before it counts as deleted
+MONITOR_MISSING_POLLS = 3
+
+# Detection events from the Shinobi webhook or websocket
+EVENT_MOTION_TIMEOUT = 30
+EVENT_DEBOUNCE = 1
+
+# Recording browser
+VIDEO_PAGE_SIZE = 50
+VIDEO_INDEX_SIZE = 500
+VIDEO_INDEX_REFRESH = 30
+VIDEO_PAGE_CACHE_SIZE = 64
+
+# Latency samples kept per endpoint for percentiles
+STATS_WINDOW = 500
+STATS_ENDPOINTS = ("monitors", "snapshot", "mode", "videos")
+
+# Last good monitor list, restored at startup before the first refresh
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+# Hot paths log one in this many calls when debug logging is enabled
+TRACE_SAMPLE_RATE = 20
+
+# Server health and recording bitrate, polled only while their sensors are enabled
+HEALTH_SCAN_INTERVAL = 300
+HEALTH_CONCURRENCY = 4
+HEALTH_VIDEO_LIMIT = 3
@@ -0,0 +1,498 @@
+"""Data update coordinator for the Shinobi Video integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from functools import partial
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import ShinobiApi
+from .const import (
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    SCAN_INTERVAL_QUIET_FACTOR,
+    SCAN_INTERVAL_JITTER,
+    SCAN_INTERVAL_COMMAND_PERIOD,
+    ERROR_BACKOFF_MAX,
+    PUSH_SCAN_INTERVAL,
+    PUSH_RECONNECT_MAX,
+    MONITOR_MISSING_POLLS,
+    SERVER_POLL_DEADLINE,
+    STORAGE_SAVE_DELAY,
+)
+from .events import parse_detection
+from .models import DetectionEvent, Monitor, parse_server_health
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ShinobiDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Monitor]]):
+    """Keep the monitor list of one or more Shinobi servers up to date.
+
+    All servers are polled concurrently and merged into one index keyed by
+    Monitor.key. A poll only waits SERVER_POLL_DEADLINE seconds for slow
+    servers; their monitors are merged in whenever they answer.
+
+    While the Shinobi websockets are connected, monitor changes are applied as
+    they are pushed and the list is only re-fetched on a slow safety interval.
+    When a socket drops we fall back to polling until it is back, polling
+    quickly after changes and slowing down while the fleet is quiet. Errors
+    back off exponentially with jitter.
+
+    The last good monitor list is kept in ``store`` so entities can be set up
+    from it at startup while the first refresh runs in the background.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        apis: dict[str, ShinobiApi],
+        min_interval: float = DEFAULT_SCAN_INTERVAL_MIN,
+        max_interval: float = DEFAULT_SCAN_INTERVAL_MAX,
+        store: Store | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        max_interval = max(min_interval, max_interval)
+        interval = min(max(DEFAULT_SCAN_INTERVAL, min_interval), max_interval)
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=interval),
+        )
+        self.apis = apis
+        self._store = store
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._interval = float(interval)
+        self._error_count = 0
+        # Monotonic time until which polls stay fast after a command
+        self._fast_until = 0.0
+        self._server_monitors: dict[str, dict[str, Monitor]] = {}
+        # Last raw monitor list per server, to skip parsing an unchanged one
+        self._server_lists: dict[str, list[dict[str, Any]]] = {}
+        self._polls: dict[str, asyncio.Task] = {}
+        self._late_servers: set[str] = set()
+        # Per server, how many polls in a row each known monitor was missing from
+        self._missing_monitors: dict[str, dict[str, int]] = {}
+        # Servers whose last poll failed, their monitors show as unavailable
+        self.failed_servers: set[str] = set()
+        self._push_tasks: dict[str, asyncio.Task] = {}
+        self._push_connected: set[str] = set()
+        # Dispatched with (monitor key, DetectionEvent) for every detection
+        self.event_signal = f"{DOMAIN}_{id(self)}_event"
+        # Monitors whose entity-visible fields changed in the last update
+        self.changed_monitors: set[str] = set()
+        # Monitors that disappeared in the last update
+        self.removed_monitors: set[str] = set()
+        self._fingerprints: dict[str, tuple] = {}
+        # Last monitor lists handed to the store
+        self._stored: dict[str, list[dict[str, Any]]] = {}
+        # Mode each monitor was last told to switch to, shown until Shinobi
+        # confirms it, and the task sending it
+        self._pending_modes: dict[str, str] = {}
+        self._mode_tasks: dict[str, asyncio.Task[bool]] = {}
+        # Per-camera stream profile overrides, set by the select entities
+        self.stream_profiles: dict[str, str] = {}
+        self.stream_profile_signal = f"{DOMAIN}_{id(self)}_stream_profile"
+        # CPU, RAM and disk use per server as last pushed by Shinobi
+        self.server_health: dict[str, dict[str, float | None]] = {}
+        self.server_health_signal = f"{DOMAIN}_{id(self)}_server_health"
+
+    @property
+    def push_connected(self) -> bool:
+        """Return true if every server pushes its changes."""
+        return self._push_connected.issuperset(self.apis)
+
+    def get_api(self, monitor: Monitor) -> ShinobiApi:
+        """Return the API client of the server a monitor lives on."""
+        return self.apis[monitor.server_id]
+
+    def find_monitor(self, mid: str, group_key: str | None = None) -> Monitor | None:
+        """Find a monitor by its Shinobi ID, optionally within a group."""
+        for server_id, api in self.apis.items():
+            if group_key and api.group_key != group_key:
+                continue
+            if monitor := self._server_monitors.get(server_id, {}).get(Monitor.make_key(server_id, mid)):
+                return monitor
+        return None
+
+    @callback
+    def async_handle_detection(self, monitor: Monitor, event: DetectionEvent) -> None:
+        """Hand a detection to the event entities of a monitor."""
+        async_dispatcher_send(self.hass, self.event_signal, monitor.key, event)
+
+    async def async_restore(self) -> bool:
+        """Load the last good monitor list, return true if there was one."""
+        if self._store is None or not isinstance(stored := await self._store.async_load(), dict):
+            return False
+        for server_id, monitors in stored.items():
+            if server_id not in self.apis or not isinstance(monitors, list):
+                continue
+            self._server_monitors[server_id] = {
+                monitor.key: monitor
+                for monitor in (Monitor.from_api(raw, server_id) for raw in monitors)
+            }
+        if not self._server_monitors:
+            return False
+        _LOGGER.debug("Restored %d monitors from storage", sum(map(len, self._server_monitors.values())))
+        self._stored = self._data_to_store()
+        self.async_set_updated_data(self._diff_monitors(self._merge_servers()))
+        return True
+
+    @callback
+    def _data_to_store(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the monitor list of every server in API form, without credentials."""
+        return {
+            server_id: [monitor.stored for monitor in monitors.values()]
+            for server_id, monitors in self._server_monitors.items()
+        }
+
+    @callback
+    def async_set_stream_profile(self, key: str, profile: str) -> None:
+        """Override the stream profile of a camera."""
+        if self.stream_profiles.get(key) == profile:
+            return
+        self.stream_profiles[key] = profile
+        async_dispatcher_send(self.hass, self.stream_profile_signal, key)
+
+    async def _async_update_data(self) -> dict[str, Monitor]:
+        """Fetch data from all servers."""
+        tasks = {server_id: self._async_poll(server_id) for server_id in self.apis}
+        # The first refresh waits for every server, later ones only up to a deadline
+        timeout = None if self.data is None else SERVER_POLL_DEADLINE
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+
+        errors = []
+        for server_id, task in tasks.items():
+            if task in pending:
+                _LOGGER.debug("Shinobi at %s is slow, merging it when it answers", self.apis[server_id].url)
+                self._late_servers.add(server_id)
+            elif (err := task.exception() or task.result()) is not None:
+                _LOGGER.error("Error communicating with Shinobi API at %s: %s", self.apis[server_id].url, err)
+                errors.append(err)
+                self.failed_servers.add(server_id)
+            else:
+                self.failed_servers.discard(server_id)
+
+        if errors and len(errors) == len(tasks):
+            self._adapt_interval(error=True)
+            raise UpdateFailed(f"Error communicating with API: {errors[0]}")
+
+        _LOGGER.debug("Successfully refreshed data from Shinobi API")
+        data = self._diff_monitors(self._merge_servers())
+        self._adapt_interval(active=bool(self.changed_monitors))
+        return data
+
+    def _async_poll(self, server_id: str) -> asyncio.Task:
+        """Return the in-flight poll of a server, starting one if needed."""
+        if (task := self._polls.get(server_id)) is None:
+            task = self._polls[server_id] = self.hass.async_create_task(
+                self._async_fetch_server(server_id)
+            )
+        return task
+
+    async def _async_fetch_server(self, server_id: str) -> Exception | None:
+        """Fetch the monitors of one server.
+
+        Errors are raised, except for a late poll nobody was waiting for; it
+        returns its error instead, for a refresh that picks up the same task.
+        """
+        # Modes sent before this fetch started are settled by its result
+        settled = {
+            key: mode
+            for key, mode in self._pending_modes.items()
+            if key not in self._mode_tasks and key in self._server_monitors.get(server_id, {})
+        }
+        try:
+            monitors = await self.apis[server_id].get_monitors()
+        except Exception as err:
+            if server_id not in self._late_servers:
+                raise
+            self._late_servers.discard(server_id)
+            _LOGGER.error("Error communicating with Shinobi API at %s: %s", self.apis[server_id].url, err)
+            self.failed_servers.add(server_id)
+            self.async_update_listeners()
+            return err
+        finally:
+            self._polls.pop(server_id, None)
+
+        previous = self._server_monitors.get(server_id, {})
+        # The API returns the same list object when it was not modified
+        if monitors is not self._server_lists.get(server_id):
+            self._server_lists[server_id] = monitors
+            # Shinobi returns a list of monitors. Convert to dict for easier lookup.
+            self._server_monitors[server_id] = self._retain_missing(
+                server_id,
+                {
+                    monitor.key: monitor
+                    for monitor in (Monitor.from_api(raw, server_id) for raw in monitors)
+                },
+                previous,
+            )
+        elif missing := self._missing_monitors.get(server_id):
+            self._server_monitors[server_id] = self._retain_missing(
+                server_id, {key: monitor for key, monitor in previous.items() if key not in missing}, previous
+            )
+        for key, mode in settled.items():
+            if key not in self._mode_tasks and self._pending_modes.get(key) == mode:
+                del self._pending_modes[key]
+        if server_id in self._late_servers:
+            self._late_servers.discard(server_id)
+            self.failed_servers.discard(server_id)
+            self.async_set_updated_data(self._diff_monitors(self._merge_servers()))
+        return None
+
+    def _retain_missing(
+        self, server_id: str, fetched: dict[str, Monitor], previous: dict[str, Monitor]
+    ) -> dict[str, Monitor]:
+        """Keep monitors missing from a fetched list until MONITOR_MISSING_POLLS in a row.
+
+        A server that answers with a partial list once would otherwise get the
+        devices of the missing monitors deleted.
+        """
+        missing = self._missing_monitors.setdefault(server_id, {})
+        for key in list(missing):
+            if key in fetched or key not in previous:
+                del missing[key]
+        for key, monitor in previous.items():
+            if key in fetched:
+                continue
+            missing[key] = missing.get(key, 0) + 1
+            if missing[key] < MONITOR_MISSING_POLLS:
+                fetched[key] = monitor
+            else:
+                del missing[key]
+        return fetched
+
+    def _merge_servers(self) -> dict[str, Monitor]:
+        """Merge the monitors of all servers into one index.
+
+        Modes that are still being sent are shown instead of the fetched ones.
+        """
+        if len(self._server_monitors) == 1:
+            data = dict(next(iter(self._server_monitors.values())))
+        else:
+            data = {}
+            for monitors in self._server_monitors.values():
+                data.update(monitors)
+        for key, mode in self._pending_modes.items():
+            if (monitor := data.get(key)) is not None and monitor.mode != mode:
+                data[key] = monitor.replace(mode=mode)
+        return data
+
+    @callback
+    def _async_set_monitors(self, server_id: str, monitors: dict[str, Monitor]) -> None:
+        """Replace the monitors of one server and notify listeners."""
+        self._server_monitors[server_id] = monitors
+        self.async_set_updated_data(self._diff_monitors(self._merge_servers()))
+
+    def _adapt_interval(self, active: bool = False, error: bool = False) -> None:
+        """Pick the delay until the next poll."""
+        if error:
+            self._error_count += 1
+            interval = min(self._min_interval * 2**self._error_count, ERROR_BACKOFF_MAX)
+        else:
+            self._error_count = 0
+            # The optimistic mode hides the change a command causes, so
+            # poll fast for a fixed period after one instead
+            if active or time.monotonic() < self._fast_until:
+                self._interval = self._min_interval
+            else:
+                self._interval = min(self._interval * SCAN_INTERVAL_QUIET_FACTOR, self._max_interval)
+            interval = PUSH_SCAN_INTERVAL if self.push_connected else self._interval
+
+        # Jitter keeps many installs from polling one server in lockstep
+        interval *= random.uniform(1 - SCAN_INTERVAL_JITTER, 1 + SCAN_INTERVAL_JITTER)
+        self.update_interval = timedelta(seconds=interval)
+
+    def _diff_monitors(self, data: dict[str, Monitor]) -> dict[str, Monitor]:
+        """Record which monitors changed since the last update."""
+        fingerprints = {}
+        changed = set()
+        for key, monitor in data.items():
+            fingerprint = fingerprints[key] = monitor.fingerprint
+            if self._fingerprints.get(key) != fingerprint:
+                changed.add(key)
+        removed = self._fingerprints.keys() - fingerprints.keys()
+        changed.update(removed)
+
+        if changed:
+            _LOGGER.debug("Monitors changed: %s", ", ".join(sorted(changed)))
+        if self._store is not None:
+            # Cheap while the monitors are unchanged, the lists hold the same objects
+            stored = self._data_to_store()
+            if stored != self._stored:
+                self._stored = stored
+                self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+        self.changed_monitors = changed
+        self.removed_monitors = removed
+        self._fingerprints = fingerprints
+        return data
+
+    async def async_change_modes(self, keys: list[str], mode: str) -> dict[str, bool]:
+        """Change monitor modes and wait until they are sent."""
+        tasks = {
+            key: task for key in keys if (task := self.async_queue_mode(key, mode)) is not None
+        }
+        results = await asyncio.gather(*(asyncio.shield(task) for task in tasks.values()))
+        return dict(zip(tasks, results))
+
+    @callback
+    def async_queue_mode(self, key: str, mode: str) -> asyncio.Task[bool] | None:
+        """Change the mode of a monitor, showing the new mode right away.
+
+        Each monitor has at most one command in flight. Commands queued
+        meanwhile collapse into the last one, which is sent when the current
+        one finishes. The returned task tells whether the last mode was set.
+        """
+        if self.data is None or key not in self.data:
+            return None
+        self._pending_modes[key] = mode
+        self.async_set_updated_data(self._diff_monitors(self._merge_servers()))
+        # Poll quickly for a while to pick up the consequences of the command
+        self._interval = self._min_interval
+        self._fast_until = time.monotonic() + SCAN_INTERVAL_COMMAND_PERIOD
+        if (task := self._mode_tasks.get(key)) is None:
+            task = self._mode_tasks[key] = self.hass.async_create_task(
+                self._async_send_modes(key), f"{DOMAIN} set mode {key}"
+            )
+        return task
+
+    async def _async_send_modes(self, key: str) -> bool:
+        """Send the pending mode of a monitor until it stops changing."""
+        ok = False
+        sent = None
+        try:
+            # A failed command is followed by a newer one queued meanwhile
+            while (mode := self._pending_modes.get(key)) is not None and mode != sent:
+                if (monitor := self.data.get(key)) is None:
+                    self._pending_modes.pop(key, None)
+                    break
+                sent = mode
+                ok = await self.apis[monitor.server_id].async_change_mode(monitor.mid, mode)
+        finally:
+            del self._mode_tasks[key]
+            # Until the refresh confirms it, keep showing a mode that was sent
+            if not ok and sent is not None and self._pending_modes.get(key) == sent:
+                del self._pending_modes[key]
+                self.async_set_updated_data(self._diff_monitors(self._merge_servers()))
+        # One coalesced refresh to confirm what Shinobi actually did
+        await self.async_request_refresh()
+        return ok
+
+    @callback
+    def async_start_push(self) -> None:
+        """Start listening to the Shinobi websockets."""
+        for server_id in self.apis:
+            if server_id not in self._push_tasks:
+                self._push_tasks[server_id] = self.hass.async_create_background_task(
+                    self._async_push_loop(server_id), f"{DOMAIN} websocket {server_id}"
+                )
+
+    @callback
+    def async_stop_push(self) -> None:
+        """Stop listening to the Shinobi websockets."""
+        for task in self._push_tasks.values():
+            task.cancel()
+        self._push_tasks.clear()
+        self._push_connected.clear()
+
+    async def _async_push_loop(self, server_id: str) -> None:
+        """Keep a websocket connection open, reconnecting with backoff."""
+        api = self.apis[server_id]
+        backoff = 1
+        while True:
+            try:
+                await api.async_listen(
+                    partial(self._handle_push_event, server_id),
+                    partial(self._handle_push_connected, server_id),
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Shinobi websocket error at %s: %s", api.url, err)
+
+            if server_id in self._push_connected:
+                self._handle_push_disconnected(server_id)
+                backoff = 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, PUSH_RECONNECT_MAX)
+
+    @callback
+    def _handle_push_connected(self, server_id: str) -> None:
+        """Switch to push mode and resync anything missed while disconnected."""
+        _LOGGER.debug("Shinobi websocket connected at %s", self.apis[server_id].url)
+        self._push_connected.add(server_id)
+        if self.push_connected:
+            self.update_interval = timedelta(seconds=PUSH_SCAN_INTERVAL)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _handle_push_disconnected(self, server_id: str) -> None:
+        """Fall back to polling."""
+        _LOGGER.debug("Shinobi websocket disconnected at %s, falling back to polling", self.apis[server_id].url)
+        self._push_connected.discard(server_id)
+        self._interval = self._min_interval
+        self.update_interval = timedelta(seconds=self._interval)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _handle_push_event(self, server_id: str, event: dict[str, Any]) -> None:
+        """Apply a single pushed monitor change to the coordinator data."""
+        kind = event.get("f")
+        if kind in ("os", "diskUsed"):
+            self.server_health.setdefault(server_id, {}).update(parse_server_health(event))
+            async_dispatcher_send(self.hass, self.server_health_signal, server_id)
+            return
+        if self.data is None:
+            return
+
+        mid = event.get("mid") or event.get("id")
+        if not mid:
+            return
+
+        monitors = self._server_monitors.get(server_id, {})
+        key = Monitor.make_key(server_id, mid)
+        if kind == "monitor_status":
+            monitor = monitors.get(key)
+            if monitor is None or monitor.status == event.get("status"):
+                return
+            monitor = monitor.replace(status=event.get("status"))
+        elif kind == "monitor_edit":
+            mon = event.get("mon")
+            if not isinstance(mon, dict):
+                return
+            previous = monitors.get(key)
+            monitor = Monitor.from_api(
+                {**(previous.as_dict() if previous else {}), **mon, "mid": mid}, server_id
+            )
+            # The pushed mode is authoritative unless we are still sending one
+            if key not in self._mode_tasks:
+                self._pending_modes.pop(key, None)
+        elif kind == "detector_trigger":
+            if monitor := monitors.get(key):
+                self.async_handle_detection(monitor, parse_detection(event.get("details")))
+            return
+        elif kind == "monitor_delete":
+            if key not in monitors:
+                return
+            monitors = dict(monitors)
+            monitors.pop(key)
+            self._async_set_monitors(server_id, monitors)
+            return
+        else:
+            return
+
+        _LOGGER.debug("Applying pushed %s for monitor %s", kind, key)
+        self._async_set_monitors(server_id, {**monitors, key: monitor})
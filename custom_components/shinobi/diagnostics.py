@@ -0,0 +1,39 @@
+"""Diagnostics support for Shinobi Video."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_URL, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_GROUP_KEY, DOMAIN
+
+TO_REDACT = {CONF_API_KEY, CONF_GROUP_KEY, CONF_URL, CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "monitors": len(coordinator.data or {}),
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "push_connected": coordinator.push_connected,
+            "last_update_success": coordinator.last_update_success,
+        },
+        "servers": {
+            server_id or "primary": {
+                "requests": api.stats.as_dict(),
+                "circuit": api.breaker.as_dict(),
+                "snapshot_cache": api.snapshot_cache.as_dict(),
+                "health": coordinator.server_health.get(server_id),
+            }
+            for server_id, api in coordinator.apis.items()
+        },
+    }
@@ -0,0 +1,89 @@
+"""Base entity for the Shinobi Video integration."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import ShinobiDataUpdateCoordinator
+from .models import Monitor
+
+
+@callback
+def async_add_monitor_entities(
+    entry: ConfigEntry,
+    coordinator: ShinobiDataUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[[Monitor], list[Entity]],
+) -> None:
+    """Add the entities of every running monitor, now and as monitors appear.
+
+    Stopped monitors get their entities once they start. Entities of deleted
+    monitors go away with their device when the coordinator reports them.
+    """
+    added: set[str] = set()
+
+    @callback
+    def _async_add(keys: Iterable[str]) -> None:
+        entities = []
+        for key in keys:
+            if (monitor := coordinator.data.get(key)) is None:
+                added.discard(key)
+            elif key not in added and not monitor.is_stopped:
+                added.add(key)
+                entities.extend(create_entities(monitor))
+        if entities:
+            async_add_entities(entities)
+
+    _async_add(list(coordinator.data))
+    # Only monitors that changed can have appeared or started
+    entry.async_on_unload(
+        coordinator.async_add_listener(lambda: _async_add(coordinator.changed_monitors))
+    )
+
+
+class ShinobiEntity(CoordinatorEntity[ShinobiDataUpdateCoordinator]):
+    """Base class for entities bound to a single Shinobi monitor."""
+
+    def __init__(self, coordinator: ShinobiDataUpdateCoordinator, monitor: Monitor) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        # The key is unique across servers, the ID is what Shinobi knows it by
+        self._monitor_key = monitor.key
+        self._monitor_id = monitor.mid
+        self._server_id = monitor.server_id
+        self._written_available: bool | None = None
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, monitor.key)},
+            name=monitor.name,
+            manufacturer="Shinobi",
+            model=monitor.type,
+        )
+
+    @property
+    def monitor(self) -> Monitor | None:
+        """Return the current data of our monitor."""
+        return self.coordinator.data.get(self._monitor_key)
+
+    @property
+    def available(self) -> bool:
+        """Return false while the server of our monitor cannot be reached."""
+        return super().available and self._server_id not in self.coordinator.failed_servers
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write state when our monitor or the availability changed."""
+        available = self.available
+        if (
+            available == self._written_available
+            and self._monitor_key not in self.coordinator.changed_monitors
+        ):
+            return
+        self._written_available = available
+        super()._handle_coordinator_update()
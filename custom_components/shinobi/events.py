@@ -0,0 +1,77 @@
+"""Detection events pushed by Shinobi for the Shinobi Video integration."""
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from homeassistant.core import HomeAssistant
+
+from .models import DetectionEvent, json_loads
+
+if TYPE_CHECKING:
+    from .coordinator import ShinobiDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_detection(details: Any) -> DetectionEvent:
+    """Parse the details of a Shinobi detection.
+
+    Accepts the ``details`` object of a ``detector_trigger`` event as well as
+    the flat parameters of a webhook call.
+    """
+    if isinstance(details, str):
+        try:
+            details = json_loads(details)
+        except ValueError:
+            details = {}
+    if not isinstance(details, dict):
+        details = {}
+
+    objects: set[str] = set()
+    for matrix in details.get("matrices") or ():
+        if isinstance(matrix, dict) and matrix.get("tag"):
+            objects.add(str(matrix["tag"]))
+    tags = details.get("objects") or details.get("tags") or ()
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    objects.update(str(tag).strip() for tag in tags if str(tag).strip())
+
+    reason = str(details.get("reason") or ("object" if objects else "motion"))
+    return DetectionEvent(reason, frozenset(objects))
+
+
+async def async_handle_webhook(
+    coordinator: ShinobiDataUpdateCoordinator,
+    hass: HomeAssistant,
+    webhook_id: str,
+    request: web.Request,
+) -> web.Response:
+    """Handle a detection sent by the Shinobi webhook.
+
+    The monitor is given as ``mid`` (or ``monitor_id``/``id``) and optionally
+    ``ke`` (or ``group_key``), either in the query string or a JSON body.
+    """
+    params: dict[str, Any] = dict(request.query)
+    if request.method == "POST" and request.can_read_body:
+        try:
+            body = await request.json(loads=json_loads)
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            params.update(body)
+
+    mid = params.get("mid") or params.get("monitor_id") or params.get("id")
+    if not mid:
+        return web.Response(status=400, text="Missing monitor ID")
+
+    monitor = coordinator.find_monitor(str(mid), params.get("ke") or params.get("group_key"))
+    if monitor is None:
+        _LOGGER.debug("Ignoring detection for unknown monitor %s", mid)
+        return web.Response(status=404, text="Unknown monitor")
+
+    details = params.get("details")
+    coordinator.async_handle_detection(monitor, parse_detection(details if details else params))
+    return web.Response(status=200)
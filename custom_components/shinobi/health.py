@@ -0,0 +1,73 @@
+"""Recording bitrate of Shinobi monitors, polled only while it is watched."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import DOMAIN, HEALTH_CONCURRENCY, HEALTH_SCAN_INTERVAL, HEALTH_VIDEO_LIMIT
+from .coordinator import ShinobiDataUpdateCoordinator
+from .models import Monitor
+from .recordings import Recording
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ShinobiHealthCoordinator(DataUpdateCoordinator[dict[str, float | None]]):
+    """Recording bitrate in kbit/s per monitor key.
+
+    Polled on its own HEALTH_SCAN_INTERVAL. A coordinator only schedules
+    refreshes while it has listeners, and the bitrate sensors are disabled by
+    default, so nothing is fetched until one is enabled. Each sensor listens
+    with its monitor key as context and only those monitors are fetched.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: ShinobiDataUpdateCoordinator) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} health",
+            update_interval=timedelta(seconds=HEALTH_SCAN_INTERVAL),
+        )
+        self._coordinator = coordinator
+        self._semaphore = asyncio.Semaphore(HEALTH_CONCURRENCY)
+
+    async def _async_update_data(self) -> dict[str, float | None]:
+        """Fetch the latest recordings of the watched monitors."""
+        monitors = self._coordinator.data or {}
+        watched = [monitors[key] for key in set(self.async_contexts()) if key in monitors]
+        results = await asyncio.gather(
+            *(self._async_bitrate(monitor) for monitor in watched), return_exceptions=True
+        )
+
+        data: dict[str, float | None] = {}
+        failed = 0
+        for monitor, result in zip(watched, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Could not fetch recordings of %s: %s", monitor.key, result)
+                failed += 1
+                # Keep the last figure rather than dropping to unknown
+                result = (self.data or {}).get(monitor.key)
+            data[monitor.key] = result
+        if watched and failed == len(watched):
+            raise UpdateFailed("Could not fetch recordings from Shinobi")
+        return data
+
+    async def _async_bitrate(self, monitor: Monitor) -> float | None:
+        """Return the bitrate of the newest finished recording of a monitor."""
+        async with self._semaphore:
+            videos = await self._coordinator.get_api(monitor).async_get_videos(
+                monitor.mid, limit=HEALTH_VIDEO_LIMIT
+            )
+        # The newest recording is usually still being written
+        for video in videos:
+            recording = Recording.from_api(video)
+            if recording is None or recording.end is None or not recording.size:
+                continue
+            if (seconds := (recording.end - recording.start).total_seconds()) > 0:
+                return recording.size * 8 / seconds / 1000
+        return None
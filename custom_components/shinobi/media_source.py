@@ -0,0 +1,152 @@
+"""Media source for browsing Shinobi recordings."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import logging
+from urllib.parse import quote, unquote
+
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.components.media_player import MediaClass, MediaType
+from homeassistant.components.media_source import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+    Unresolvable,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, VIDEO_PAGE_SIZE
+from .models import Monitor
+from .recordings import Recording
+from .views import get_video_path
+
+_LOGGER = logging.getLogger(__name__)
+
+SIGNED_PATH_EXPIRATION = timedelta(hours=4)
+
+
+async def async_get_media_source(hass: HomeAssistant) -> MediaSource:
+    """Set up the Shinobi media source."""
+    return ShinobiMediaSource(hass)
+
+
+class ShinobiMediaSource(MediaSource):
+    """Browse Shinobi recordings by monitor, newest first.
+
+    Identifiers are ``entry/monitor`` for the newest recordings,
+    ``entry/monitor/<timestamp>`` for older pages and
+    ``entry/monitor/clip/<filename>`` for a single recording.
+    """
+
+    name = "Shinobi Video"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Resolve a recording to a signed, range-capable URL."""
+        parts = item.identifier.split("/")
+        if len(parts) != 4 or parts[2] != "clip":
+            raise Unresolvable(f"Unknown Shinobi media item: {item.identifier}")
+        entry_id, monitor_key, _, filename = parts
+        monitor = self._get_monitor(entry_id, monitor_key)
+
+        path = async_sign_path(
+            self.hass, get_video_path(entry_id, monitor, filename), SIGNED_PATH_EXPIRATION
+        )
+        return PlayMedia(path, f"video/{filename.rpartition('.')[2]}")
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Browse monitors and their recordings."""
+        if not item.identifier:
+            return self._browse_root()
+
+        parts = item.identifier.split("/")
+        entry_id, monitor_key = parts[0], parts[1] if len(parts) > 1 else ""
+        monitor = self._get_monitor(entry_id, monitor_key)
+        index = self.hass.data[DOMAIN][entry_id]["recordings"]
+
+        try:
+            if len(parts) == 2:
+                recordings = await index.async_recent(monitor)
+                before = None
+            else:
+                before = datetime.fromtimestamp(float(parts[2]), timezone.utc)
+                recordings = await index.async_page(monitor, before)
+        except Exception as err:
+            raise Unresolvable(f"Could not list recordings: {err}") from err
+
+        base = self._monitor_item(monitor, item.identifier)
+        if before is not None:
+            base.title = f"{monitor.name} before {before:%Y-%m-%d %H:%M}"
+        base.children = [self._recording_item(entry_id, monitor, recording) for recording in recordings]
+        # Page further back with a time range so we never pull whole lists
+        if recordings and (before is None or len(recordings) >= VIDEO_PAGE_SIZE):
+            oldest = recordings[-1].start
+            older = self._monitor_item(
+                monitor, f"{entry_id}/{quote(monitor.key, safe='')}/{oldest.timestamp():.0f}"
+            )
+            older.title = "Older recordings"
+            base.children.append(older)
+        return base
+
+    def _get_monitor(self, entry_id: str, monitor_key: str) -> Monitor:
+        """Return the monitor an identifier refers to."""
+        data = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        monitor = data and (data["coordinator"].data or {}).get(unquote(monitor_key))
+        if not monitor:
+            raise Unresolvable(f"Unknown Shinobi monitor: {monitor_key}")
+        return monitor
+
+    def _browse_root(self) -> BrowseMediaSource:
+        """List the monitors of every entry."""
+        base = BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=None,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type=MediaType.VIDEO,
+            title=self.name,
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.DIRECTORY,
+        )
+        base.children = [
+            self._monitor_item(monitor, f"{entry_id}/{quote(monitor.key, safe='')}")
+            for entry_id, data in self.hass.data.get(DOMAIN, {}).items()
+            for monitor in sorted((data["coordinator"].data or {}).values(), key=lambda m: m.name)
+        ]
+        return base
+
+    @staticmethod
+    def _monitor_item(monitor: Monitor, identifier: str) -> BrowseMediaSource:
+        """Return a folder of recordings."""
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=identifier,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type=MediaType.VIDEO,
+            title=monitor.name,
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.VIDEO,
+        )
+
+    @staticmethod
+    def _recording_item(entry_id: str, monitor: Monitor, recording: Recording) -> BrowseMediaSource:
+        """Return a playable recording."""
+        start = recording.start.astimezone()
+        title = f"{start:%Y-%m-%d %H:%M:%S}"
+        if recording.end:
+            title += f" ({(recording.end - recording.start).total_seconds():.0f}s)"
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=f"{entry_id}/{quote(monitor.key, safe='')}/clip/{recording.filename}",
+            media_class=MediaClass.VIDEO,
+            media_content_type=recording.mime_type,
+            title=title,
+            can_play=True,
+            can_expand=False,
+        )
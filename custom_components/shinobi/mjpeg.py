@@ -0,0 +1,162 @@
+"""MJPEG fan-out relay for the Shinobi Video integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+BOUNDARY = "shinobiframe"
+# Frames buffered per viewer; slow viewers drop the oldest frame
+VIEWER_QUEUE_SIZE = 2
+# Give up on an upstream that never sends a frame boundary
+MAX_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+class MjpegRelay:
+    """Share one upstream MJPEG connection between many viewers."""
+
+    def __init__(self, monitor_id: str, open_stream: Callable[[], Any], on_close: Callable[[MjpegRelay], None]) -> None:
+        """Initialize the relay."""
+        self.monitor_id = monitor_id
+        self._open_stream = open_stream
+        self._on_close = on_close
+        self._viewers: set[asyncio.Queue[bytes | None]] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def viewer_count(self) -> int:
+        """Return the number of connected viewers."""
+        return len(self._viewers)
+
+    async def async_handle(self, request: web.Request) -> web.StreamResponse:
+        """Stream the shared upstream frames to one viewer."""
+        # Subscribe before the first await, so the relay cannot close and drop
+        # out of the manager while this viewer is still being set up
+        queue = self._subscribe()
+        response = web.StreamResponse()
+        response.content_type = "multipart/x-mixed-replace"
+        response.headers["Content-Type"] = f"multipart/x-mixed-replace;boundary={BOUNDARY}"
+        try:
+            await response.prepare(request)
+            while (frame := await queue.get()) is not None:
+                await response.write(
+                    b"--%s\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n%s\r\n"
+                    % (BOUNDARY.encode(), len(frame), frame)
+                )
+        except (ConnectionResetError, RuntimeError):
+            pass
+        finally:
+            self._unsubscribe(queue)
+        return response
+
+    def _subscribe(self) -> asyncio.Queue[bytes | None]:
+        """Add a viewer, starting the upstream connection if needed."""
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(VIEWER_QUEUE_SIZE)
+        self._viewers.add(queue)
+        if self._task is None:
+            _LOGGER.debug("Opening upstream MJPEG stream for %s", self.monitor_id)
+            self._task = asyncio.create_task(self._async_relay())
+        return queue
+
+    def _unsubscribe(self, queue: asyncio.Queue[bytes | None]) -> None:
+        """Remove a viewer, closing the upstream when it was the last one."""
+        self._viewers.discard(queue)
+        if not self._viewers:
+            self.close()
+
+    def close(self) -> None:
+        """Close the upstream connection and disconnect all viewers."""
+        if self._task is not None:
+            _LOGGER.debug("Closing upstream MJPEG stream for %s", self.monitor_id)
+            self._task.cancel()
+            self._task = None
+        for queue in self._viewers:
+            self._put(queue, None)
+        self._viewers.clear()
+        self._on_close(self)
+
+    def _broadcast(self, frame: bytes) -> None:
+        """Hand a frame to every viewer."""
+        for queue in self._viewers:
+            self._put(queue, frame)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue[bytes | None], frame: bytes | None) -> None:
+        """Queue a frame, dropping the oldest one for slow viewers."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(frame)
+
+    async def _async_relay(self) -> None:
+        """Read the upstream stream and broadcast each JPEG frame."""
+        try:
+            async with self._open_stream() as response:
+                response.raise_for_status()
+                if (boundary := _get_boundary(response.headers.get("content-type", ""))) is None:
+                    raise ValueError("Upstream is not a multipart MJPEG stream")
+                delimiter = b"--" + boundary.encode()
+                buffer = bytearray()
+                async for chunk in response.content.iter_any():
+                    buffer += chunk
+                    while (start := buffer.find(delimiter)) != -1:
+                        end = buffer.find(delimiter, start + len(delimiter))
+                        if end == -1:
+                            del buffer[:start]
+                            break
+                        part = bytes(buffer[start + len(delimiter) : end])
+                        del buffer[:end]
+                        header_end = part.find(b"\r\n\r\n")
+                        if header_end != -1 and (frame := part[header_end + 4 :].rstrip(b"\r\n")):
+                            self._broadcast(frame)
+                    if len(buffer) > MAX_BUFFER_SIZE:
+                        _LOGGER.warning("No MJPEG frame boundary from %s, closing stream", self.monitor_id)
+                        break
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Error reading MJPEG stream for %s: %s", self.monitor_id, err)
+
+        # Upstream ended on its own, disconnect the viewers
+        self._task = None
+        self.close()
+
+
+class MjpegRelayManager:
+    """Keep one MJPEG relay per monitor."""
+
+    def __init__(self) -> None:
+        """Initialize the manager."""
+        self._relays: dict[str, MjpegRelay] = {}
+
+    async def async_handle(
+        self, request: web.Request, monitor_id: str, open_stream: Callable[[], Any]
+    ) -> web.StreamResponse:
+        """Attach a viewer to the relay of a monitor."""
+        if (relay := self._relays.get(monitor_id)) is None:
+            relay = self._relays[monitor_id] = MjpegRelay(monitor_id, open_stream, self._remove)
+        return await relay.async_handle(request)
+
+    def _remove(self, relay: MjpegRelay) -> None:
+        """Forget a relay that has no viewers left."""
+        if self._relays.get(relay.monitor_id) is relay:
+            del self._relays[relay.monitor_id]
+
+    def close(self) -> None:
+        """Close every relay."""
+        for relay in list(self._relays.values()):
+            relay.close()
+
+
+def _get_boundary(content_type: str) -> str | None:
+    """Return the multipart boundary from a Content-Type header."""
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "boundary":
+            value = value.strip('"')
+            return value[2:] if value.startswith("--") else value
+    return None
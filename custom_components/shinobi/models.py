@@ -0,0 +1,273 @@
+"""Data models for the Shinobi Video integration."""
+from __future__ import annotations
+
+from typing import Any
+from urllib.parse import quote
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+from .const import STREAM_PROFILES, STREAM_PROFILE_RTSP, STREAM_PROFILE_SHINOBI, STREAM_PROFILE_SUBSTREAM
+
+STREAM_TYPES = ("hls", "rtsp", "webrtc", "mp4")
+RTSP_SCHEMES = ("rtsp://", "rtsps://")
+# Top-level monitor fields describing the camera input
+CONNECTION_FIELDS = ("protocol", "host", "port", "path")
+# The parts of a Shinobi monitor object the integration reads, the rest of
+# the monitor configuration is dropped as soon as it is decoded
+MONITOR_FIELDS = ("mid", "name", "type", "status", "mode", "details", "streams", *CONNECTION_FIELDS)
+DETAIL_FIELDS = ("stream_type", "auto_host", "auto_host_enable", "muser", "mpass", "substream")
+# Camera credentials, never written to storage
+CREDENTIAL_FIELDS = ("muser", "mpass")
+
+
+class DetectionEvent:
+    """A motion or object detection reported by Shinobi."""
+
+    __slots__ = ("reason", "objects")
+
+    def __init__(self, reason: str, objects: frozenset[str]) -> None:
+        """Initialize the event."""
+        self.reason = reason
+        self.objects = objects
+
+
+class Monitor:
+    """A Shinobi monitor, parsed once per refresh.
+
+    Everything the entities read is derived up front so property access is a
+    plain attribute lookup.
+    """
+
+    __slots__ = (
+        "server_id",
+        "key",
+        "mid",
+        "name",
+        "type",
+        "status",
+        "mode",
+        "details",
+        "streams",
+        "stream_url",
+        "stream_type",
+        "supports_stream",
+        "connection",
+        "direct_sources",
+        "stream_profiles",
+        "is_recording",
+        "is_stopped",
+        "attributes",
+        "status_attributes",
+        "fingerprint",
+        "stored",
+    )
+
+    def __init__(
+        self,
+        mid: str,
+        name: str,
+        type: str | None,
+        status: str | None,
+        mode: str | None,
+        details: dict[str, Any],
+        streams: list[str],
+        server_id: str = "",
+        connection: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the monitor."""
+        self.server_id = server_id
+        self.key = self.make_key(server_id, mid)
+        self.mid = mid
+        self.name = name
+        self.type = type
+        self.status = status
+        self.mode = mode
+        self.details = details
+        self.streams = streams
+
+        self.stream_url = streams[0] if streams else None
+        self.stream_type = details.get("stream_type", "hls")
+        self.supports_stream = self.stream_type in STREAM_TYPES
+        self.connection = connection or {}
+        # RTSP URLs of the camera itself, by stream profile
+        self.direct_sources = _direct_sources(self.connection, details)
+        self.stream_profiles = [
+            profile
+            for profile in STREAM_PROFILES
+            if profile in self.direct_sources or (profile == STREAM_PROFILE_SHINOBI and self.supports_stream)
+        ]
+        # Mode can be 'record', 'watch', 'stop', 'start'
+        self.is_recording = mode == "record"
+        self.is_stopped = status == "Stopped"
+
+        self.attributes = {"mid": mid, "type": type}
+        if self.stream_url:
+            self.attributes["stream_url"] = self.stream_url
+        self.status_attributes = {"mid": mid, "type": type, "mode": mode}
+        if self.stream_url:
+            self.status_attributes["stream_url"] = self.stream_url
+
+        # The fields entities read, for change detection
+        self.fingerprint = (
+            name,
+            type,
+            status,
+            mode,
+            self.stream_url,
+            tuple(sorted(self.connection.items())),
+            tuple(sorted(self.direct_sources.items())),
+            tuple(self.stream_profiles),
+        )
+        # What the coordinator keeps in storage
+        self.stored = self._as_stored()
+
+    @staticmethod
+    def make_key(server_id: str, mid: str) -> str:
+        """Return the key of a monitor across all servers of an entry.
+
+        Monitors of the primary server are keyed by their plain ID.
+        """
+        return f"{server_id}/{mid}" if server_id else mid
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any], server_id: str = "") -> Monitor:
+        """Build a monitor from a Shinobi API monitor object."""
+        details = parse_details(data.get("details"))
+
+        streams = data.get("streams")
+        if not isinstance(streams, list):
+            streams = []
+
+        return cls(
+            data["mid"],
+            data.get("name") or data["mid"],
+            data.get("type"),
+            data.get("status"),
+            data.get("mode"),
+            details,
+            streams,
+            server_id,
+            {field: data[field] for field in CONNECTION_FIELDS if data.get(field) is not None},
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the monitor in Shinobi API form."""
+        return {
+            "mid": self.mid,
+            "name": self.name,
+            "type": self.type,
+            "status": self.status,
+            "mode": self.mode,
+            "details": self.details,
+            "streams": self.streams,
+            **self.connection,
+        }
+
+    def _as_stored(self) -> dict[str, Any]:
+        """Return the monitor in API form without the camera credentials."""
+        details = {field: value for field, value in self.details.items() if field not in CREDENTIAL_FIELDS}
+        if isinstance(auto_host := details.get("auto_host"), str):
+            details["auto_host"] = _strip_credentials(auto_host)
+        substream = details.get("substream")
+        substream_input = substream.get("input") if isinstance(substream, dict) else None
+        if isinstance(substream_input, dict) and isinstance(address := substream_input.get("fulladdress"), str):
+            details["substream"] = {"input": {"fulladdress": _strip_credentials(address)}}
+        return {**self.as_dict(), "details": details}
+
+    def replace(self, **changes: Any) -> Monitor:
+        """Return a copy of the monitor with some fields changed."""
+        return Monitor.from_api({**self.as_dict(), **changes}, self.server_id)
+
+
+
+def parse_details(details: Any) -> dict[str, Any]:
+    """Return the monitor details the integration reads.
+
+    Shinobi sends them as a JSON string inside the monitor object.
+    """
+    if isinstance(details, (str, bytes)):
+        try:
+            details = json_loads(details)
+        except ValueError:
+            return {}
+    if not isinstance(details, dict):
+        return {}
+    trimmed = {field: details[field] for field in DETAIL_FIELDS if field in details}
+    if isinstance(substream := trimmed.get("substream"), dict):
+        substream_input = substream.get("input")
+        address = substream_input.get("fulladdress") if isinstance(substream_input, dict) else None
+        trimmed["substream"] = {"input": {"fulladdress": address}}
+    else:
+        # Shinobi sends null or an empty string when there is no substream
+        trimmed.pop("substream", None)
+    return trimmed
+
+
+def parse_server_health(event: dict[str, Any]) -> dict[str, float | None]:
+    """Return the server health figures of a pushed ``os`` or ``diskUsed`` event.
+
+    Shinobi pushes CPU and RAM load in percent, newer versions send RAM as an
+    object with a ``percent`` field. Disk use and the group limit are in MB.
+    """
+    if event.get("f") == "os":
+        ram = event.get("ram")
+        if isinstance(ram, dict):
+            ram = ram.get("percent")
+        return {"cpu": _number(event.get("cpu")), "ram": _number(ram)}
+    return {"disk_used": _number(event.get("size")), "disk_limit": _number(event.get("limit"))}
+
+
+def _number(value: Any) -> float | None:
+    """Return a number Shinobi may send as a string, or None."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def trim_monitor(data: dict[str, Any]) -> dict[str, Any]:
+    """Return a Shinobi monitor object with only the fields the integration reads."""
+    monitor = {field: data[field] for field in MONITOR_FIELDS if field in data}
+    monitor["details"] = parse_details(data.get("details"))
+    return monitor
+
+
+def _strip_credentials(url: str) -> str:
+    """Remove the user and password from a URL.
+
+    Camera passwords are often not URL encoded and may contain ``/``, so
+    everything up to the last ``@`` goes, even at the cost of an ``@`` in
+    the path.
+    """
+    scheme, separator, rest = url.partition("://")
+    if not separator:
+        return url
+    query = min((index for index in (rest.find("?"), rest.find("#")) if index != -1), default=len(rest))
+    return f"{scheme}://{rest[:query].rpartition('@')[2]}{rest[query:]}"
+
+
+def _direct_sources(connection: dict[str, Any], details: dict[str, Any]) -> dict[str, str]:
+    """Return the RTSP URLs the camera can be read from directly."""
+    sources = {}
+    auto_host = details.get("auto_host")
+    if details.get("auto_host_enable") == "1" and isinstance(auto_host, str) and auto_host.startswith(RTSP_SCHEMES):
+        sources[STREAM_PROFILE_RTSP] = auto_host
+    elif connection.get("protocol") in ("rtsp", "rtsps") and connection.get("host"):
+        credentials = ""
+        if user := details.get("muser"):
+            credentials = f"{quote(str(user), safe='')}:{quote(str(details.get('mpass') or ''), safe='')}@"
+        port = f":{connection['port']}" if connection.get("port") else ""
+        path = str(connection.get("path") or "")
+        if path and not path.startswith("/"):
+            path = f"/{path}"
+        sources[STREAM_PROFILE_RTSP] = f"{connection['protocol']}://{credentials}{connection['host']}{port}{path}"
+
+    substream = details.get("substream")
+    if isinstance(substream, dict) and isinstance(substream_input := substream.get("input"), dict):
+        address = substream_input.get("fulladdress")
+        if isinstance(address, str) and address.startswith(RTSP_SCHEMES):
+            sources[STREAM_PROFILE_SUBSTREAM] = address
+    return sources
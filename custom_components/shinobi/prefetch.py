@@ -0,0 +1,126 @@
+"""Snapshot prefetching for the Shinobi Video integration."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import heapq
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.components.websocket_api.const import DATA_CONNECTIONS
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DOMAIN,
+    PREFETCH_CONCURRENCY,
+    PREFETCH_MIN_VIEWS,
+    PREFETCH_REFRESH_AGE,
+    PREFETCH_VIEW_HALF_LIFE,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import ShinobiDataUpdateCoordinator
+
+
+class SnapshotPrefetcher:
+    """Keep the snapshots of the most viewed monitors fresh in the cache.
+
+    Camera views are counted with exponential decay and the ``hot_count``
+    monitors with the most recent views are hot. At most ``rate`` times per
+    second, the hot snapshot that is closest to expiring is refreshed, with
+    at most PREFETCH_CONCURRENCY fetches in flight. Nothing is fetched while
+    no frontend is connected to the websocket API.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: ShinobiDataUpdateCoordinator,
+        hot_count: int,
+        rate: float,
+    ) -> None:
+        """Initialize the prefetcher."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._hot_count = hot_count
+        self._interval = timedelta(seconds=1 / rate)
+        # Decayed view count and when it was last updated, per monitor key
+        self._views: dict[str, tuple[float, float]] = {}
+        self._inflight = 0
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start prefetching."""
+        if self._unsub is None and self._hot_count > 0:
+            self._unsub = async_track_time_interval(
+                self._hass, self._async_tick, self._interval, name=f"{DOMAIN} snapshot prefetch"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop prefetching."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def record_view(self, key: str) -> None:
+        """Count a camera image request by a viewer."""
+        if self._unsub is None:
+            return
+        now = time.monotonic()
+        self._views[key] = (self._decayed(key, now) + 1, now)
+
+    def _decayed(self, key: str, now: float) -> float:
+        """Return the view count of a monitor as of now."""
+        if (entry := self._views.get(key)) is None:
+            return 0.0
+        count, updated = entry
+        return count * 0.5 ** ((now - updated) / PREFETCH_VIEW_HALF_LIFE)
+
+    def hot_monitors(self) -> list[str]:
+        """Return the keys of the most viewed monitors."""
+        now = time.monotonic()
+        scores = {key: self._decayed(key, now) for key in self._views}
+        for key, score in scores.items():
+            if score < PREFETCH_MIN_VIEWS:
+                del self._views[key]
+        return heapq.nlargest(
+            self._hot_count,
+            (key for key, score in scores.items() if score >= PREFETCH_MIN_VIEWS),
+            key=scores.__getitem__,
+        )
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        """Spend one request of the budget on the stalest hot snapshot."""
+        if self._inflight >= PREFETCH_CONCURRENCY or not self._hass.data.get(DATA_CONNECTIONS):
+            return
+
+        stalest = None
+        stalest_age = 0.0
+        for key in self.hot_monitors():
+            if (monitor := self._coordinator.data.get(key)) is None:
+                continue
+            cache = self._coordinator.get_api(monitor).snapshot_cache
+            if cache.ttl <= 0:
+                continue
+            age = cache.age(monitor.mid)
+            age = float("inf") if age is None else age / cache.ttl
+            if age >= PREFETCH_REFRESH_AGE and age > stalest_age:
+                stalest, stalest_age = monitor, age
+
+        if stalest is not None:
+            self._inflight += 1
+            self._hass.async_create_background_task(
+                self._async_prefetch(stalest.key), f"{DOMAIN} prefetch {stalest.key}"
+            )
+
+    async def _async_prefetch(self, key: str) -> None:
+        """Refresh the cached snapshot of a monitor."""
+        try:
+            if monitor := self._coordinator.data.get(key):
+                await self._coordinator.get_api(monitor).async_refresh_camera_image(monitor.mid)
+        finally:
+            self._inflight -= 1
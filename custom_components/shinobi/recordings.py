@@ -0,0 +1,118 @@
+"""Index of Shinobi recordings for the Shinobi Video integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import VIDEO_PAGE_SIZE, VIDEO_INDEX_SIZE, VIDEO_INDEX_REFRESH, VIDEO_PAGE_CACHE_SIZE
+from .models import Monitor
+
+if TYPE_CHECKING:
+    from .coordinator import ShinobiDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Recording:
+    """A single Shinobi recording."""
+
+    __slots__ = ("filename", "start", "end", "size", "ext")
+
+    def __init__(self, filename: str, start: datetime, end: datetime | None, size: int, ext: str) -> None:
+        """Initialize the recording."""
+        self.filename = filename
+        self.start = start
+        self.end = end
+        self.size = size
+        self.ext = ext
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> Recording | None:
+        """Build a recording from a Shinobi API video object."""
+        filename = data.get("filename")
+        start = dt_util.parse_datetime(str(data.get("time") or ""))
+        if not filename or start is None:
+            return None
+        end = dt_util.parse_datetime(str(data.get("end") or ""))
+        ext = data.get("ext") or filename.rpartition(".")[2]
+        return cls(filename, dt_util.as_utc(start), end and dt_util.as_utc(end), int(data.get("size") or 0), ext)
+
+    @property
+    def mime_type(self) -> str:
+        """Return the MIME type of the recording."""
+        return f"video/{self.ext}"
+
+
+class RecordingIndex:
+    """Recent recordings per monitor, plus a cache of older pages.
+
+    The recent list is refreshed incrementally: only recordings newer than
+    the newest one already known are fetched. Older pages are fetched by time
+    range on demand and cached, since finished recordings do not change.
+    """
+
+    def __init__(self, coordinator: ShinobiDataUpdateCoordinator) -> None:
+        """Initialize the index."""
+        self._coordinator = coordinator
+        self._recent: dict[str, list[Recording]] = {}
+        self._refreshed: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._pages: OrderedDict[tuple[str, datetime], list[Recording]] = OrderedDict()
+
+    async def async_recent(self, monitor: Monitor) -> list[Recording]:
+        """Return the newest recordings of a monitor, newest first."""
+        lock = self._locks.setdefault(monitor.key, asyncio.Lock())
+        async with lock:
+            if time.monotonic() - self._refreshed.get(monitor.key, 0) > VIDEO_INDEX_REFRESH:
+                await self._async_refresh(monitor)
+        return self._recent.get(monitor.key, [])
+
+    async def async_page(self, monitor: Monitor, before: datetime) -> list[Recording]:
+        """Return a page of recordings that started before a point in time."""
+        key = (monitor.key, before)
+        if (page := self._pages.get(key)) is None:
+            page = await self._async_fetch(monitor, end=before, limit=VIDEO_PAGE_SIZE)
+            # The end of the range is inclusive on the Shinobi side
+            page = [recording for recording in page if recording.start < before]
+            self._pages[key] = page
+            while len(self._pages) > VIDEO_PAGE_CACHE_SIZE:
+                self._pages.popitem(last=False)
+        self._pages.move_to_end(key)
+        return page
+
+    async def _async_refresh(self, monitor: Monitor) -> None:
+        """Fetch recordings newer than the newest one we know."""
+        known = self._recent.get(monitor.key, [])
+        if known:
+            new = await self._async_fetch(monitor, start=known[0].start, limit=VIDEO_INDEX_SIZE)
+        else:
+            new = await self._async_fetch(monitor, limit=VIDEO_PAGE_SIZE)
+
+        # The newest known recording may have grown since, replace it
+        filenames = {recording.filename for recording in new}
+        merged = new + [recording for recording in known if recording.filename not in filenames]
+        merged.sort(key=lambda recording: recording.start, reverse=True)
+        self._recent[monitor.key] = merged[:VIDEO_INDEX_SIZE]
+        self._refreshed[monitor.key] = time.monotonic()
+        _LOGGER.debug("Fetched %d new recordings for %s", len(new), monitor.key)
+
+    async def _async_fetch(
+        self,
+        monitor: Monitor,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[Recording]:
+        """Fetch recordings of a monitor from its server."""
+        videos = await self._coordinator.get_api(monitor).async_get_videos(
+            monitor.mid, start=start, end=end, limit=limit
+        )
+        recordings = [recording for video in videos if (recording := Recording.from_api(video))]
+        recordings.sort(key=lambda recording: recording.start, reverse=True)
+        return recordings
@@ -0,0 +1,62 @@
+"""Select platform for Shinobi Video."""
+from __future__ import annotations
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from .const import DOMAIN, STREAM_PROFILE_AUTO
+from .entity import ShinobiEntity, async_add_monitor_entities
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the select platform."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    async_add_monitor_entities(
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda monitor: [ShinobiStreamProfileSelect(coordinator, monitor)] if monitor.stream_profiles else [],
+    )
+
+
+class ShinobiStreamProfileSelect(ShinobiEntity, SelectEntity, RestoreEntity):
+    """Choose where the camera stream of a monitor comes from."""
+
+    _attr_entity_category = EntityCategory.CONFIG
+    _attr_translation_key = "stream_profile"
+
+    def __init__(self, coordinator, monitor) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator, monitor)
+        self._attr_name = f"{monitor.name} Stream Profile"
+        self._attr_unique_id = f"shinobi_{self._monitor_key}_stream_profile"
+        self._attr_current_option = STREAM_PROFILE_AUTO
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last selected profile."""
+        await super().async_added_to_hass()
+        if (state := await self.async_get_last_state()) and state.state in self.options:
+            self._attr_current_option = state.state
+        self.coordinator.async_set_stream_profile(self._monitor_key, self._attr_current_option)
+
+    @property
+    def options(self) -> list[str]:
+        """Return the profiles this monitor offers."""
+        if monitor := self.monitor:
+            return [STREAM_PROFILE_AUTO, *monitor.stream_profiles]
+        return [STREAM_PROFILE_AUTO]
+
+    async def async_select_option(self, option: str) -> None:
+        """Select a stream profile."""
+        self._attr_current_option = option
+        self.coordinator.async_set_stream_profile(self._monitor_key, option)
+        self.async_write_ha_state()
@@ -1,15 +1,27 @@
+from datetime import timedelta
 from typing import Any
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfDataRate, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 import logging
-from .const import DOMAIN
+from .api import ShinobiApi
+from .const import DOMAIN, STATS_ENDPOINTS
+from .coordinator import ShinobiDataUpdateCoordinator
+from .entity import ShinobiEntity, async_add_monitor_entities
+from .health import ShinobiHealthCoordinator
+from .models import Monitor
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only the diagnostic sensors poll, the monitor sensors follow the coordinator
+SCAN_INTERVAL = timedelta(seconds=60)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -19,54 +31,180 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
+    health = data["health"]
 
-    monitors_dict = coordinator.data
-    if not monitors_dict:
-        _LOGGER.warning("No monitors found to set up sensor entities")
-        return
-
-    _LOGGER.debug("Setting up %d sensor entities", len(monitors_dict))
-
-    entities = []
-    for mid, monitor in monitors_dict.items():
-        if monitor.get("status") != "Stopped":
-            entities.append(ShinobiStatusSensor(coordinator, monitor))
+    # Disabled by default, enable them to watch the load on the Shinobi node
+    diagnostics = []
+    for server_id, api in coordinator.apis.items():
+        diagnostics.append(ShinobiSnapshotCacheSensor(entry, server_id, api))
+        for endpoint in STATS_ENDPOINTS:
+            diagnostics.append(ShinobiLatencySensor(entry, server_id, api, endpoint))
+        diagnostics.extend(
+            [
+                ShinobiDiskUsageSensor(entry, coordinator, server_id),
+                ShinobiServerHealthSensor(entry, coordinator, server_id, "CPU usage", "cpu"),
+                ShinobiServerHealthSensor(entry, coordinator, server_id, "RAM usage", "ram"),
+            ]
+        )
+    async_add_entities(diagnostics)
 
-    async_add_entities(entities)
+    async_add_monitor_entities(
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda monitor: [ShinobiStatusSensor(coordinator, monitor), ShinobiBitrateSensor(health, monitor)],
+    )
 
 
-class ShinobiStatusSensor(CoordinatorEntity, SensorEntity):
+class ShinobiStatusSensor(ShinobiEntity, SensorEntity):
     """Representation of a Shinobi Monitor Status sensor."""
 
     def __init__(self, coordinator, monitor) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._monitor_id = monitor["mid"]
-        self._attr_name = f"{monitor['name']} Status"
-        self._attr_unique_id = f"shinobi_{self._monitor_id}_status"
+        super().__init__(coordinator, monitor)
+        self._attr_name = f"{monitor.name} Status"
+        self._attr_unique_id = f"shinobi_{self._monitor_key}_status"
 
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        monitor = self.coordinator.data.get(self._monitor_id)
-        if monitor:
-            return monitor.get("status")
+        if monitor := self.monitor:
+            return monitor.status
         return None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
-        monitor = self.coordinator.data.get(self._monitor_id)
-        if monitor:
-            extra_attributes = {
-                "mid": monitor.get("mid"),
-                "type": monitor.get("type"),
-                "mode": monitor.get("mode"),
-            }
-            
-            streams = monitor.get("streams", [])
-            if streams and isinstance(streams, list):
-                extra_attributes["stream_url"] = streams[0]
-            
-            return extra_attributes
+        if monitor := self.monitor:
+            return monitor.status_attributes
         return {}
+
+
+class ShinobiServerSensor(SensorEntity):
+    """Base class for the diagnostic sensors of one Shinobi server."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, server_id: str, api: ShinobiApi, name: str, key: str) -> None:
+        """Initialize the sensor."""
+        self._api = api
+        server = f" {server_id}" if server_id else ""
+        self._attr_name = f"Shinobi{server} {name}"
+        self._attr_unique_id = f"shinobi_{entry.entry_id}_{server_id}_{key}"
+
+
+class ShinobiLatencySensor(ShinobiServerSensor):
+    """95th percentile latency of one Shinobi API endpoint."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+
+    def __init__(self, entry: ConfigEntry, server_id: str, api: ShinobiApi, endpoint: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry, server_id, api, f"{endpoint.capitalize()} latency", f"{endpoint}_latency")
+        self._endpoint = endpoint
+
+    async def async_update(self) -> None:
+        """Read the rolling statistics of the endpoint."""
+        stats = self._api.stats.endpoint(self._endpoint).as_dict()
+        self._attr_native_value = stats.pop("p95_ms")
+        self._attr_extra_state_attributes = stats
+
+
+class ShinobiSnapshotCacheSensor(ShinobiServerSensor):
+    """Hit rate of the snapshot cache."""
+
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, entry: ConfigEntry, server_id: str, api: ShinobiApi) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry, server_id, api, "Snapshot cache hit rate", "snapshot_cache")
+
+    async def async_update(self) -> None:
+        """Read the snapshot cache counters."""
+        stats = self._api.snapshot_cache.as_dict()
+        hit_rate = stats.pop("hit_rate")
+        self._attr_native_value = None if hit_rate is None else hit_rate * 100
+        self._attr_extra_state_attributes = stats
+
+
+class ShinobiServerHealthSensor(ShinobiServerSensor):
+    """CPU or RAM load of a Shinobi server, as pushed over its websocket."""
+
+    _attr_should_poll = False
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+
+    def __init__(
+        self, entry: ConfigEntry, coordinator: ShinobiDataUpdateCoordinator, server_id: str, name: str, key: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry, server_id, coordinator.apis[server_id], name, key)
+        self._coordinator = coordinator
+        self._server_id = server_id
+        self._key = key
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the figures Shinobi pushes."""
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, self._coordinator.server_health_signal, self._async_health_pushed)
+        )
+        self._read_health(self._coordinator.server_health.get(self._server_id, {}))
+
+    @callback
+    def _async_health_pushed(self, server_id: str) -> None:
+        """Update the state when our server pushed new figures."""
+        if server_id == self._server_id:
+            self._read_health(self._coordinator.server_health[server_id])
+            self.async_write_ha_state()
+
+    def _read_health(self, health: dict[str, float | None]) -> None:
+        """Read our figure from the server health."""
+        self._attr_native_value = health.get(self._key)
+
+
+class ShinobiDiskUsageSensor(ShinobiServerHealthSensor):
+    """Share of the group storage limit used by recordings."""
+
+    def __init__(self, entry: ConfigEntry, coordinator: ShinobiDataUpdateCoordinator, server_id: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry, coordinator, server_id, "Disk usage", "disk")
+
+    def _read_health(self, health: dict[str, float | None]) -> None:
+        """Compute the usage from the used space and the limit, both in MB."""
+        used, limit = health.get("disk_used"), health.get("disk_limit")
+        self._attr_native_value = used / limit * 100 if used is not None and limit else None
+        self._attr_extra_state_attributes = {"used_mb": used, "limit_mb": limit}
+
+
+class ShinobiBitrateSensor(CoordinatorEntity[ShinobiHealthCoordinator], SensorEntity):
+    """Bitrate of the newest finished recording of a monitor."""
+
+    _attr_device_class = SensorDeviceClass.DATA_RATE
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfDataRate.KILOBITS_PER_SECOND
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+
+    def __init__(self, health: ShinobiHealthCoordinator, monitor: Monitor) -> None:
+        """Initialize the sensor."""
+        # The context tells the health coordinator which monitors to fetch
+        super().__init__(health, context=monitor.key)
+        self._monitor_key = monitor.key
+        self._attr_name = f"{monitor.name} Recording bitrate"
+        self._attr_unique_id = f"shinobi_{monitor.key}_bitrate"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, monitor.key)})
+
+    async def async_added_to_hass(self) -> None:
+        """Start listening and fetch now instead of a whole interval later."""
+        await super().async_added_to_hass()
+        self.hass.async_create_task(self.coordinator.async_request_refresh())
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the bitrate in kbit/s."""
+        return (self.coordinator.data or {}).get(self._monitor_key)
@@ -0,0 +1,145 @@
+"""Services for the Shinobi Video integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    DOMAIN,
+    MODES,
+    SERVICE_SET_MODE,
+    SERVICE_CREATE_SNAPSHOT_SUMMARY,
+    ATTR_MODE,
+    ATTR_MONITOR_IDS,
+    ATTR_FORMAT,
+    ATTR_MINUTES,
+    ATTR_PER_MONITOR,
+    ATTR_FPS,
+    FORMAT_CONTACT_SHEET,
+    FORMAT_TIMELAPSE,
+    TIMELAPSE_MEDIA_DIR,
+)
+from .timelapse import build_contact_sheet, build_timelapse
+
+_LOGGER = logging.getLogger(__name__)
+
+SET_MODE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_MODE): vol.In(MODES),
+        vol.Optional(ATTR_MONITOR_IDS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+
+CREATE_SNAPSHOT_SUMMARY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CONTACT_SHEET): vol.In((FORMAT_CONTACT_SHEET, FORMAT_TIMELAPSE)),
+        vol.Optional(ATTR_MONITOR_IDS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MINUTES, default=60): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+        vol.Optional(ATTR_PER_MONITOR, default=False): cv.boolean,
+        vol.Optional(ATTR_FPS, default=8): vol.All(vol.Coerce(float), vol.Range(min=1, max=30)),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Shinobi services."""
+    if hass.services.has_service(DOMAIN, SERVICE_SET_MODE):
+        return
+
+    async def async_set_mode(call: ServiceCall) -> ServiceResponse:
+        """Change the mode of some or all monitors at once."""
+        mode = call.data[ATTR_MODE]
+        wanted = call.data.get(ATTR_MONITOR_IDS)
+
+        jobs = []
+        for data in hass.data.get(DOMAIN, {}).values():
+            coordinator = data["coordinator"]
+            # Monitors can be given by plain ID or by server-qualified key
+            keys = [
+                key
+                for key, monitor in (coordinator.data or {}).items()
+                if not wanted or key in wanted or monitor.mid in wanted
+            ]
+            if keys:
+                jobs.append(coordinator.async_change_modes(keys, mode))
+
+        results: dict[str, bool] = {}
+        for entry_results in await asyncio.gather(*jobs):
+            results.update(entry_results)
+
+        _LOGGER.debug("Set mode %s on %d monitors", mode, len(results))
+        return {"results": results}
+
+    async def async_create_snapshot_summary(call: ServiceCall) -> ServiceResponse:
+        """Build contact sheets or timelapses from the snapshot buffers."""
+        wanted = call.data.get(ATTR_MONITOR_IDS)
+        timelapse = call.data[ATTR_FORMAT] == FORMAT_TIMELAPSE
+        until = dt_util.utcnow().timestamp()
+        since = until - call.data[ATTR_MINUTES] * 60
+
+        rows = []
+        for data in hass.data.get(DOMAIN, {}).values():
+            coordinator = data["coordinator"]
+            for key, monitor in (coordinator.data or {}).items():
+                if wanted and key not in wanted and monitor.mid not in wanted:
+                    continue
+                if frames := data["snapshots"].frames(key, since):
+                    rows.append((monitor.name, frames))
+        if not rows:
+            raise HomeAssistantError("No snapshots of these monitors were kept in the requested time")
+
+        directory = Path(hass.config.media_dirs.get("local", hass.config.path("media"))) / TIMELAPSE_MEDIA_DIR
+        stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+        files = []
+        for group in [[row] for row in rows] if call.data[ATTR_PER_MONITOR] else [rows]:
+            name = slugify(group[0][0]) if len(group) == 1 else "all"
+            if timelapse:
+                path = directory / f"{name}_timelapse_{stamp}.webp"
+                content = await hass.async_add_executor_job(
+                    build_timelapse, group, since, until, call.data[ATTR_FPS]
+                )
+            else:
+                path = directory / f"{name}_contact_sheet_{stamp}.jpg"
+                content = await hass.async_add_executor_job(build_contact_sheet, group, since, until)
+            await hass.async_add_executor_job(_write_file, path, content)
+            files.append(str(path))
+
+        _LOGGER.debug("Created %s", ", ".join(files))
+        return {"files": files}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_MODE,
+        async_set_mode,
+        schema=SET_MODE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CREATE_SNAPSHOT_SUMMARY,
+        async_create_snapshot_summary,
+        schema=CREATE_SNAPSHOT_SUMMARY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the Shinobi services once no entries are left."""
+    if not hass.data.get(DOMAIN):
+        hass.services.async_remove(DOMAIN, SERVICE_SET_MODE)
+        hass.services.async_remove(DOMAIN, SERVICE_CREATE_SNAPSHOT_SUMMARY)
+
+
+def _write_file(path: Path, content: bytes) -> None:
+    """Write a file, creating its directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
@@ -0,0 +1,120 @@
+"""Request statistics for the Shinobi Video integration."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+from .const import (
+    ADAPTIVE_MIN_SAMPLES,
+    REQUEST_TIMEOUT_MAX,
+    REQUEST_TIMEOUT_MIN,
+    REQUEST_TIMEOUT_P99_FACTOR,
+    STATS_WINDOW,
+)
+
+
+class EndpointStats:
+    """Rolling latency percentiles and counters for one API endpoint."""
+
+    __slots__ = ("calls", "errors", "timeouts", "bytes", "_latencies", "_sorted")
+
+    def __init__(self, window: int = STATS_WINDOW) -> None:
+        """Initialize the statistics."""
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes = 0
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] | None = None
+
+    def record(self, latency: float, size: int = 0, error: bool = False, timeout: bool = False) -> None:
+        """Record one finished call."""
+        self.calls += 1
+        self.bytes += size
+        self.errors += error
+        self.timeouts += timeout
+        self._latencies.append(latency)
+        self._sorted = None
+
+    def percentile(self, percent: float, min_samples: int = 1) -> float | None:
+        """Return a latency percentile in seconds over the rolling window."""
+        if len(self._latencies) < max(min_samples, 1):
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._latencies)
+        return self._sorted[min(len(self._sorted) - 1, int(len(self._sorted) * percent / 100))]
+
+    def timeout(self) -> float:
+        """Return the timeout for the next call, derived from the p99 latency."""
+        if (p99 := self.percentile(99, ADAPTIVE_MIN_SAMPLES)) is None:
+            return REQUEST_TIMEOUT_MAX
+        return min(max(p99 * REQUEST_TIMEOUT_P99_FACTOR, REQUEST_TIMEOUT_MIN), REQUEST_TIMEOUT_MAX)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics, latencies in milliseconds."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "bytes": self.bytes,
+            **{
+                f"p{percent}_ms": None if (value := self.percentile(percent)) is None else round(value * 1000, 1)
+                for percent in (50, 95, 99)
+            },
+            "timeout_s": round(self.timeout(), 2),
+        }
+
+
+class CallResult:
+    """Filled in by the caller of ApiStats.measure."""
+
+    __slots__ = ("size", "failed", "status")
+
+    def __init__(self) -> None:
+        """Initialize the result."""
+        self.size = 0
+        self.failed = False
+        self.status: int | None = None
+
+
+class ApiStats:
+    """Statistics for every endpoint of one Shinobi server."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def endpoint(self, name: str) -> EndpointStats:
+        """Return the statistics of an endpoint."""
+        if (stats := self.endpoints.get(name)) is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[CallResult]:
+        """Time a call, counting exceptions and timeouts as failures."""
+        stats = self.endpoint(name)
+        result = CallResult()
+        start = time.monotonic()
+        try:
+            yield result
+        except asyncio.TimeoutError:
+            stats.record(time.monotonic() - start, timeout=True)
+            raise
+        except asyncio.CancelledError:
+            # E.g. a hedged request that lost the race still took at least this
+            # long, leaving it out would hide exactly the slow tail
+            stats.record(time.monotonic() - start)
+            raise
+        except Exception:
+            stats.record(time.monotonic() - start, error=True)
+            raise
+        stats.record(time.monotonic() - start, result.size, error=result.failed)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics of all endpoints."""
+        return {name: stats.as_dict() for name, stats in self.endpoints.items()}
@@ -0,0 +1,271 @@
+"""Contact sheets and timelapses from recent Shinobi snapshots."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from io import BytesIO
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+from PIL import Image, ImageDraw
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    TIMELAPSE_CAPTURE_CONCURRENCY,
+    TIMELAPSE_CONTACT_SHEET_COLUMNS,
+    TIMELAPSE_FRAME_SIZE,
+    TIMELAPSE_MAX_FRAMES,
+    TIMELAPSE_MIN_SPACING,
+    TIMELAPSE_WINDOW,
+)
+from .models import Monitor
+
+if TYPE_CHECKING:
+    from .coordinator import ShinobiDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# A frame is a wall clock timestamp and a downsampled JPEG
+Frame = tuple[float, bytes]
+
+
+class SnapshotBuffer:
+    """Downsampled snapshots of every monitor over the last TIMELAPSE_WINDOW.
+
+    Every snapshot the integration fetches, for viewers or by prefetching, is
+    kept at most once per TIMELAPSE_MIN_SPACING seconds per monitor, scaled
+    down in the executor. When the frames exceed ``max_bytes`` the oldest
+    ones are dropped first, whichever monitor they belong to.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_bytes: int) -> None:
+        """Initialize the buffer."""
+        self._hass = hass
+        self._max_bytes = max_bytes
+        self.size = 0
+        self._frames: dict[str, deque[Frame]] = {}
+        # Monitor key of every frame, oldest first, for eviction across monitors
+        self._order: deque[str] = deque()
+        self._last_recorded: dict[str, float] = {}
+
+    @callback
+    def async_record(self, key: str, image: bytes) -> None:
+        """Keep a downsampled copy of a snapshot, unless one was kept just now."""
+        now = time.monotonic()
+        if now - self._last_recorded.get(key, -TIMELAPSE_MIN_SPACING) < TIMELAPSE_MIN_SPACING:
+            return
+        self._last_recorded[key] = now
+        self._hass.async_create_background_task(
+            self._async_add(key, dt_util.utcnow().timestamp(), image), f"{DOMAIN} timelapse frame {key}"
+        )
+
+    async def _async_add(self, key: str, timestamp: float, image: bytes) -> None:
+        """Downsample a snapshot and add it to the buffer."""
+        try:
+            frame = await self._hass.async_add_executor_job(_downsample, image)
+        except (OSError, ValueError) as err:
+            _LOGGER.debug("Could not downsample snapshot of %s: %s", key, err)
+            return
+        self._frames.setdefault(key, deque()).append((timestamp, frame))
+        self._order.append(key)
+        self.size += len(frame)
+        self._evict(timestamp - TIMELAPSE_WINDOW)
+
+    def _evict(self, cutoff: float) -> None:
+        """Drop frames that are too old or over the memory cap."""
+        while self._order:
+            key = self._order[0]
+            frames = self._frames[key]
+            if frames[0][0] >= cutoff and self.size <= self._max_bytes:
+                return
+            self._order.popleft()
+            self.size -= len(frames.popleft()[1])
+            if not frames:
+                del self._frames[key]
+
+    def frames(self, key: str, since: float) -> list[Frame]:
+        """Return the frames of a monitor taken since a timestamp, oldest first."""
+        return [frame for frame in self._frames.get(key, ()) if frame[0] >= since]
+
+    @callback
+    def async_remove(self, keys: Iterable[str]) -> None:
+        """Forget the frames of monitors that no longer exist."""
+        keys = list(keys)
+        for key in keys:
+            self._last_recorded.pop(key, None)
+            if frames := self._frames.pop(key, None):
+                self.size -= sum(len(frame) for _, frame in frames)
+        if keys:
+            self._order = deque(key for key in self._order if key in self._frames)
+
+
+class SnapshotCapture:
+    """Fetch a snapshot of every running monitor on a fixed interval.
+
+    Only needed when the snapshots fetched for viewers are not enough to fill
+    the buffer; the fetches go through the snapshot cache.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: ShinobiDataUpdateCoordinator, interval: float
+    ) -> None:
+        """Initialize the capture."""
+        self._hass = hass
+        self._coordinator = coordinator
+        # Snapshots closer together than TIMELAPSE_MIN_SPACING are not kept
+        self._interval = max(interval, TIMELAPSE_MIN_SPACING) if interval > 0 else 0
+        self._semaphore = asyncio.Semaphore(TIMELAPSE_CAPTURE_CONCURRENCY)
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start capturing."""
+        if self._unsub is None and self._interval > 0:
+            self._unsub = async_track_time_interval(
+                self._hass,
+                self._async_capture,
+                timedelta(seconds=self._interval),
+                name=f"{DOMAIN} timelapse capture",
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop capturing."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    async def _async_capture(self, _now: datetime) -> None:
+        """Fetch a snapshot of every running monitor."""
+        if self._coordinator.data is None:
+            return
+
+        async def _fetch(monitor: Monitor) -> None:
+            async with self._semaphore:
+                await self._coordinator.get_api(monitor).async_get_camera_image(monitor.mid)
+
+        await asyncio.gather(
+            *(_fetch(monitor) for monitor in self._coordinator.data.values() if not monitor.is_stopped)
+        )
+
+
+def build_contact_sheet(rows: list[tuple[str, list[Frame]]], since: float, until: float) -> bytes:
+    """Compose a contact sheet JPEG, run in the executor.
+
+    A single monitor is laid out as a grid of its frames. Several monitors
+    get one row each, with columns for evenly spaced moments.
+    """
+    since = _first_frame(rows, since)
+    if len(rows) == 1:
+        name, frames = rows[0]
+        frames = _pick(frames, TIMELAPSE_MAX_FRAMES)
+        columns = max(1, math.ceil(math.sqrt(len(frames))))
+        tiles = [(name, frame) for frame in frames]
+    else:
+        columns = TIMELAPSE_CONTACT_SHEET_COLUMNS
+        moments = [since + (until - since) * (index + 1) / columns for index in range(columns)]
+        step = (until - since) / columns
+        tiles = [
+            (name, _at(frames, moment, step))
+            for name, frames in rows
+            for moment in moments
+        ]
+
+    sheet = _grid(tiles, columns)
+    output = BytesIO()
+    sheet.save(output, "JPEG", quality=80, optimize=True)
+    return output.getvalue()
+
+
+def build_timelapse(rows: list[tuple[str, list[Frame]]], since: float, until: float, fps: float) -> bytes:
+    """Compose an animated WebP timelapse, run in the executor.
+
+    Every frame shows all monitors at the same moment, in a grid.
+    """
+    since = _first_frame(rows, since)
+    count = min(TIMELAPSE_MAX_FRAMES, max(len(frames) for _, frames in rows))
+    step = (until - since) / max(count, 1)
+    columns = max(1, math.ceil(math.sqrt(len(rows))))
+    images = [
+        _grid(
+            [(name, _at(frames, since + step * (index + 1), None)) for name, frames in rows],
+            columns,
+        )
+        for index in range(count)
+    ]
+
+    output = BytesIO()
+    images[0].save(
+        output,
+        "WEBP",
+        save_all=True,
+        append_images=images[1:],
+        duration=int(1000 / fps),
+        loop=0,
+        quality=70,
+    )
+    return output.getvalue()
+
+
+def _downsample(image: bytes) -> bytes:
+    """Scale a snapshot down to TIMELAPSE_FRAME_SIZE."""
+    with Image.open(BytesIO(image)) as source:
+        # Let the JPEG decoder scale while decoding, much cheaper than resizing
+        source.draft("RGB", TIMELAPSE_FRAME_SIZE)
+        frame = source.convert("RGB")
+    frame.thumbnail(TIMELAPSE_FRAME_SIZE)
+    output = BytesIO()
+    frame.save(output, "JPEG", quality=70)
+    return output.getvalue()
+
+
+def _first_frame(rows: list[tuple[str, list[Frame]]], since: float) -> float:
+    """Return when the first frame was taken, so output does not start empty."""
+    return max(since, min(frames[0][0] for _, frames in rows) - 1)
+
+
+def _pick(frames: list[Frame], count: int) -> list[Frame]:
+    """Return at most ``count`` frames, evenly spread."""
+    if len(frames) <= count:
+        return frames
+    return [frames[int(index * len(frames) / count)] for index in range(count)]
+
+
+def _at(frames: list[Frame], moment: float, window: float | None) -> Frame | None:
+    """Return the last frame taken at or before a moment.
+
+    With ``window`` the frame must be at most that many seconds old.
+    """
+    found = None
+    for frame in frames:
+        if frame[0] > moment:
+            break
+        found = frame
+    if found is not None and window is not None and moment - found[0] > window:
+        return None
+    return found
+
+
+def _grid(tiles: list[tuple[str, Frame | None]], columns: int) -> Image.Image:
+    """Lay out labelled frames in a grid, leaving missing ones black."""
+    width, height = TIMELAPSE_FRAME_SIZE
+    rows = math.ceil(len(tiles) / columns)
+    sheet = Image.new("RGB", (width * columns, height * rows))
+    draw = ImageDraw.Draw(sheet)
+    for index, (name, frame) in enumerate(tiles):
+        left, top = (index % columns) * width, (index // columns) * height
+        label = name
+        if frame is not None:
+            with Image.open(BytesIO(frame[1])) as image:
+                sheet.paste(image, (left, top))
+            label = f"{name} {dt_util.as_local(dt_util.utc_from_timestamp(frame[0])):%H:%M}"
+        draw.text((left + 4, top + 4), label, fill="white", stroke_width=1, stroke_fill="black")
+    return sheet
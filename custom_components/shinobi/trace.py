@@ -0,0 +1,30 @@
+"""Sampled debug logging for hot paths of the Shinobi Video integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from .const import TRACE_SAMPLE_RATE
+
+
+class SampledLogger:
+    """Log one in every ``rate`` messages of a hot path at debug level.
+
+    Nothing is counted or formatted unless debug logging is enabled.
+    """
+
+    __slots__ = ("_logger", "_rate", "_count")
+
+    def __init__(self, logger: logging.Logger, rate: int = TRACE_SAMPLE_RATE) -> None:
+        """Initialize the sampled logger."""
+        self._logger = logger
+        self._rate = rate
+        self._count = 0
+
+    def __call__(self, msg: str, *args: Any) -> None:
+        """Log a message if it is the sampled one."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        self._count += 1
+        if self._count % self._rate == 1 or self._rate == 1:
+            self._logger.debug(msg, *args)
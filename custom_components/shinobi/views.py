@@ -0,0 +1,77 @@
+"""HTTP views for the Shinobi Video integration."""
+from __future__ import annotations
+
+import logging
+import re
+from urllib.parse import urlencode
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .models import Monitor
+
+_LOGGER = logging.getLogger(__name__)
+
+VALID_FILENAME = re.compile(r"^[\w.:-]+$")
+# Headers passed through in each direction, so players can seek with Range
+REQUEST_HEADERS = (hdrs.RANGE, hdrs.IF_RANGE)
+RESPONSE_HEADERS = (
+    hdrs.CONTENT_TYPE,
+    hdrs.CONTENT_LENGTH,
+    hdrs.CONTENT_RANGE,
+    hdrs.ACCEPT_RANGES,
+    hdrs.LAST_MODIFIED,
+    hdrs.ETAG,
+)
+
+
+def get_video_path(entry_id: str, monitor: Monitor, filename: str) -> str:
+    """Return the path of a recording served by ShinobiVideoView."""
+    path = f"/api/{DOMAIN}/video/{entry_id}/{monitor.mid}/{filename}"
+    if monitor.server_id:
+        path += "?" + urlencode({"server": monitor.server_id})
+    return path
+
+
+class ShinobiVideoView(HomeAssistantView):
+    """Proxy Shinobi recordings, including range requests."""
+
+    url = "/api/shinobi/video/{entry_id}/{monitor_id}/{filename}"
+    name = "api:shinobi:video"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(
+        self, request: web.Request, entry_id: str, monitor_id: str, filename: str
+    ) -> web.StreamResponse:
+        """Stream a recording from Shinobi."""
+        data = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if data is None or not VALID_FILENAME.match(filename):
+            raise web.HTTPNotFound()
+        coordinator = data["coordinator"]
+        key = Monitor.make_key(request.query.get("server", ""), monitor_id)
+        if (monitor := coordinator.data.get(key)) is None:
+            raise web.HTTPNotFound()
+
+        headers = {key: request.headers[key] for key in REQUEST_HEADERS if key in request.headers}
+        api = coordinator.get_api(monitor)
+        async with api.get_video_coro(monitor.mid, filename, headers) as upstream:
+            if upstream.status >= 400:
+                raise web.HTTPNotFound() if upstream.status == 404 else web.HTTPBadGateway()
+
+            response = web.StreamResponse(status=upstream.status)
+            for key in RESPONSE_HEADERS:
+                if key in upstream.headers:
+                    response.headers[key] = upstream.headers[key]
+            await response.prepare(request)
+            try:
+                async for chunk in upstream.content.iter_chunked(64 * 1024):
+                    await response.write(chunk)
+            except ConnectionResetError:
+                pass
+        return response